@@ -0,0 +1,62 @@
+"""
+Throughput of lazydate.parse() called from many threads, with and without
+request coalescing. The result cache and exact-format parser are disabled so
+every call reaches the model.
+
+    python -m benchmarks.concurrency --threads 64 --calls 20
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import lazydate
+
+TEXTS = [
+    "the date is 12th nov 1982",
+    "20./n0vembr/2020",
+    "lkererer 19 december '20 elrkererd",
+    "invoice dated 02-01-&@1907 2:24:28 am",
+]
+
+
+def _run(threads: int, calls: int, backend: str) -> float:
+    barrier = threading.Barrier(threads)
+
+    def worker(offset: int):
+        barrier.wait()
+        for i in range(calls):
+            lazydate.parse(
+                TEXTS[(offset + i) % len(TEXTS)], exact=False, backend=backend
+            )
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--max-wait", type=float, default=0.002)
+    parser.add_argument("--backend", default="numpy")
+    args = parser.parse_args()
+
+    lazydate.set_cache_size(0)
+    lazydate.warmup(args.backend)
+
+    results = {"uncoalesced_per_s": _run(args.threads, args.calls, args.backend)}
+    lazydate.enable_coalescing(max_wait=args.max_wait)
+    results["coalesced_per_s"] = _run(args.threads, args.calls, args.backend)
+    lazydate.disable_coalescing()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
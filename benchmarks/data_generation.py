@@ -0,0 +1,91 @@
+"""
+Training data generation throughput: examples/sec of generate_dates for
+different process counts, and of DataGenerator batches, against the
+per-example path it replaced.
+
+    python -m benchmarks.data_generation --n-examples 20000 --processes 1 --processes 4
+
+The baseline calls generate_date() once per example as the training code used
+to, with the costs the batched path removed put back: a fresh RandomCharAug per
+augmentation, babel's format_datetime (which parses the locale and pattern on
+every call) and one RandomState call per random draw. It uses the same seed
+and example count, and each process count is reported as a speedup over it.
+"""
+
+import argparse
+import json
+import time
+from unittest import mock
+
+import nlpaug.augmenter.char as nac
+from babel import dates
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.data_generation import (
+    BatchRandom,
+    generate_date,
+    generate_dates,
+    load_wikidata_sentences,
+)
+
+
+def _fresh_augmenter(action: str):
+    return nac.RandomCharAug(action=action, aug_char_min=1, aug_char_max=1)
+
+
+def _babel_format_datetime(date, format_str: str, locale: str) -> str:
+    return dates.format_datetime(date, format=format_str, locale=locale)
+
+
+def _baseline_examples_per_s(n_examples: int, seed: int) -> float:
+    rng = BatchRandom(seed, block_size=1)
+    with mock.patch.object(
+        data_generation, "_augmenter", _fresh_augmenter
+    ), mock.patch.object(data_generation, "format_datetime", _babel_format_datetime):
+        start = time.perf_counter()
+        for _ in range(n_examples):
+            generate_date(rng=rng)
+        return n_examples / (time.perf_counter() - start)
+
+
+def _examples_per_s(n_examples: int, processes: int, seed: int) -> float:
+    start = time.perf_counter()
+    generate_dates(n_examples, seed=seed, processes=processes)
+    return n_examples / (time.perf_counter() - start)
+
+
+def _generator_examples_per_s(n_batches: int, batch_size: int, seed: int) -> float:
+    from lazydate.models.generator import DataGenerator
+
+    generator = DataGenerator(batch_size=batch_size, seed=seed)
+    start = time.perf_counter()
+    for idx in range(n_batches):
+        generator[idx]
+    return n_batches * batch_size / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n-examples", type=int, default=20000)
+    parser.add_argument("--processes", type=int, action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-generator", action="store_true")
+    args = parser.parse_args()
+
+    # Sentence loading is a one-off cost, keep it out of the timings
+    load_wikidata_sentences()
+    baseline = _baseline_examples_per_s(args.n_examples, args.seed)
+    results = {"baseline": baseline}
+    for processes in args.processes or [1]:
+        per_s = _examples_per_s(args.n_examples, processes, args.seed)
+        results[f"processes_{processes}"] = per_s
+        results[f"processes_{processes}_speedup"] = per_s / baseline
+    if args.data_generator:
+        results["data_generator"] = _generator_examples_per_s(
+            args.n_examples // 32, 32, args.seed
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Distilled students against lstm_date_model_v05: parameters, artifact bytes,
+CPU latency per string at each batch size and sequence accuracy on held-out
+generated examples.
+
+    python -m benchmarks.distillation --n-examples 2000 --batch-size 1 --batch-size 1024
+"""
+
+import argparse
+import json
+
+from lazydate.models.artifact import UNMASKED_MODEL, artifact_path
+from lazydate.models.distillation import compare_models
+
+MODELS = [UNMASKED_MODEL, "cnn_date_model_v01", "gru_date_model_v01"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n-examples", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, action="append", dest="batch_sizes")
+    parser.add_argument(
+        "--artifact",
+        action="append",
+        dest="artifacts",
+        help="artifact directory, the packaged teacher and students by default",
+    )
+    args = parser.parse_args()
+
+    results = compare_models(
+        args.artifacts or [artifact_path(name) for name in MODELS],
+        n_examples=args.n_examples,
+        seed=args.seed,
+        batch_sizes=args.batch_sizes or [1, 1024],
+        repeats=args.repeats,
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
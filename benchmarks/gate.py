@@ -0,0 +1,77 @@
+"""
+No-date gate: false-negative rate on held-out generated examples, and model
+throughput with the gate on and off as the share of date-free inputs grows.
+
+    python -m benchmarks.gate --n-examples 10000 --no-date-share 0.1 --no-date-share 0.5
+"""
+
+import argparse
+import json
+import time
+
+import lazydate
+from lazydate.models.gate import gate_report
+
+DATES = [f"meeting on {d} march {1990 + d} at noon" for d in range(1, 29)]
+NO_DATES = [
+    "thanks for your message",
+    "see the attached invoice",
+    "the committee meets on tuesday",
+    "please find the report below",
+]
+
+
+def _letters(i: int) -> str:
+    """i in base 26 as letters, to keep date-free texts unique without digits"""
+    letters = ""
+    while True:
+        i, rem = divmod(i, 26)
+        letters += chr(ord("a") + rem)
+        if i == 0:
+            return letters
+
+
+def _texts(n: int, no_date_share: float):
+    n_no_dates = int(n * no_date_share)
+    texts = [
+        f"{NO_DATES[i % len(NO_DATES)]} ref {_letters(i)}" for i in range(n_no_dates)
+    ]
+    texts += [f"{DATES[i % len(DATES)]} ref {i}" for i in range(n - n_no_dates)]
+    return texts
+
+
+def _throughput(texts, gate: bool) -> float:
+    lazydate.set_no_date_gate(gate)
+    lazydate.clear_cache()
+    start = time.perf_counter()
+    lazydate.parse_batch(texts, exact=False)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n-examples", type=int, default=10000)
+    parser.add_argument("--n-throughput", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-date-share", type=float, action="append", dest="no_date_shares"
+    )
+    args = parser.parse_args()
+
+    lazydate.warmup()
+    throughput = {}
+    for share in args.no_date_shares or [0.1, 0.5]:
+        texts = _texts(args.n_throughput, share)
+        throughput[str(share)] = {
+            "gate_off_texts_per_s": _throughput(texts, gate=False),
+            "gate_on_texts_per_s": _throughput(texts, gate=True),
+        }
+    results = {
+        "report": gate_report(n_examples=args.n_examples, seed=args.seed),
+        "throughput": throughput,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
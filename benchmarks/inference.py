@@ -0,0 +1,284 @@
+"""
+Inference benchmark suite: parse() latency, parse_batch throughput, a
+vectorize/predict/decode breakdown, peak RSS and startup, as one JSON report.
+
+    python -m benchmarks.inference --seed 0 --out results.json
+    python -m benchmarks.inference --baseline results.json --tolerance 0.2
+
+Workloads are built from a fixed seed, so two reports from the same arguments
+measure the same inputs. "clean", "noisy" and "sentence" are self-contained;
+"generated" is drawn from lazydate.data_generation.generate_dates and needs the
+training data (it is skipped without it). The result cache is disabled, so
+every input is parsed, and inputs go through parse/parse_batch as users call
+them, so clean dates mostly take the exact-format path. The breakdown times the
+model path alone. With --baseline, every metric is compared with a
+previous report and the exit status is 1 if any regressed by more than
+--tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+import lazydate
+from benchmarks.startup import FIRST_PARSE_SNIPPET, IMPORT_SNIPPET, _time_snippet
+
+CLEAN_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d %B %Y", "%B %d, %Y", "%d %b %y"]
+SENTENCES = [
+    "Invoice #{n} was issued on {date} for consultancy services",
+    "the meeting originally planned for {date} has been postponed",
+    "Ref {n}: {date}",
+    "Delivered {date} to the warehouse at 14 Station Road, unit {n}",
+]
+# Padding for the string length sweep, cut to length
+FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod " * 4
+BATCH_SIZES = [1, 8, 64, 512]
+STRING_LENGTHS = [16, 64, 200]
+PERCENTILES = [50, 90, 99]
+
+# Metrics where larger is better, every other number is a time or a size
+_HIGHER_IS_BETTER = ("per_s",)
+
+
+def _random_date(rng: random.Random) -> date:
+    return date(1900, 1, 1) + timedelta(days=rng.randrange(365 * 200))
+
+
+def _clean(rng: random.Random) -> str:
+    return _random_date(rng).strftime(rng.choice(CLEAN_FORMATS)).lower()
+
+
+def _noisy(rng: random.Random) -> str:
+    chars = list(_clean(rng))
+    for _ in range(rng.randint(1, 3)):
+        idx = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[idx] = rng.choice("abcdefghijklmnopqrstuvwxyz0123456789./-'")
+        elif op < 0.7:
+            del chars[idx]
+        else:
+            chars.insert(idx, rng.choice(" ./-&@"))
+    return "".join(chars)
+
+
+def _sentence(rng: random.Random) -> str:
+    datestr = _clean(rng) if rng.random() < 0.5 else _noisy(rng)
+    return rng.choice(SENTENCES).format(n=rng.randint(100, 9999), date=datestr)
+
+
+def workloads(n: int, seed: int) -> Dict[str, List[str]]:
+    result = {}
+    for name, make in [("clean", _clean), ("noisy", _noisy), ("sentence", _sentence)]:
+        rng = random.Random(f"{seed}-{name}")
+        result[name] = [make(rng) for _ in range(n)]
+
+    try:
+        from lazydate.data_generation import generate_dates
+
+        result["generated"] = [d for d, _, _ in generate_dates(n, seed=seed)]
+    except (ImportError, OSError, LookupError) as e:
+        # No training data, or no nltk punkt models to tokenize it
+        print(f"Skipping generated workload: {e}", file=sys.stderr)
+    return result
+
+
+def _of_length(texts: List[str], length: int) -> List[str]:
+    """Each text cut or padded with filler text to `length` characters"""
+    return [(t + " " + FILLER)[:length] for t in texts]
+
+
+def _percentiles(timings: List[float]) -> Dict[str, float]:
+    values = np.percentile(np.array(timings) * 1e6, PERCENTILES)
+    return {f"p{p}_us": float(v) for p, v in zip(PERCENTILES, values)}
+
+
+def _latency(texts: List[str], backend: str) -> Dict[str, float]:
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        lazydate.parse(text, backend=backend)
+        timings.append(time.perf_counter() - start)
+    return _percentiles(timings)
+
+
+def _best_time(fn: Callable[[], Any], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _throughput(texts: List[str], batch_size: int, backend: str, repeats: int) -> float:
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    def run():
+        for batch in batches:
+            lazydate.parse_batch(batch, backend=backend)
+
+    return len(texts) / _best_time(run, repeats)
+
+
+def _breakdown(texts: List[str], backend: str, repeats: int) -> Dict[str, float]:
+    """Milliseconds per 1000 inputs in each stage of a model batch"""
+    from lazydate.dates import to_datetimes
+    from lazydate.parser import _load_date_model
+
+    model = _load_date_model(backend)
+    vectorizer = model.input_vectorizer
+    inputs, lengths = vectorizer.transform(texts), vectorizer.lengths(texts)
+    indices = model.predict_indices(inputs, lengths)
+    stages = {
+        "vectorize": lambda: (vectorizer.transform(texts), vectorizer.lengths(texts)),
+        "predict": lambda: model.predict_indices(inputs, lengths),
+        "decode": lambda: to_datetimes(
+            model.output_vectorizer.inverse_transform(indices)
+        ),
+    }
+    return {
+        f"{stage}_ms_per_1000": _best_time(fn, repeats) * 1e6 / len(texts)
+        for stage, fn in stages.items()
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_suite(
+    n: int, seed: int, backend: str, repeats: int, startup_repeats: int
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "meta": {
+            "lazydate_version": lazydate.__version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "backend": backend,
+            "seed": seed,
+            "n": n,
+        }
+    }
+    # Startup runs in fresh interpreters, before anything is loaded here
+    if startup_repeats:
+        report["startup"] = {
+            "import": _time_snippet(IMPORT_SNIPPET, startup_repeats),
+            "first_parse": _time_snippet(
+                FIRST_PARSE_SNIPPET.format(backend=backend), startup_repeats
+            ),
+        }
+
+    cache_size = lazydate.cache_info().maxsize
+    lazydate.set_cache_size(0)
+    lazydate.warmup(backend)
+    report["peak_rss_after_warmup_mb"] = _peak_rss_mb()
+
+    texts = workloads(n, seed)
+    report["latency"] = {
+        name: _latency(workload, backend) for name, workload in texts.items()
+    }
+    report["throughput"] = {
+        name: {
+            f"batch_{batch_size}_per_s": _throughput(
+                workload, batch_size, backend, repeats
+            )
+            for batch_size in BATCH_SIZES
+        }
+        for name, workload in texts.items()
+    }
+    mixed = [t for workload in texts.values() for t in workload]
+    report["throughput_by_length"] = {
+        f"length_{length}_per_s": _throughput(
+            _of_length(mixed, length), max(BATCH_SIZES), backend, repeats
+        )
+        for length in STRING_LENGTHS
+    }
+    report["breakdown"] = _breakdown(mixed, backend, repeats)
+    report["peak_rss_mb"] = _peak_rss_mb()
+    lazydate.set_cache_size(cache_size)
+    return report
+
+
+def _flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        if key == "meta":
+            continue
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> Dict[str, Dict[str, float]]:
+    """
+    :return: metric name -> baseline, current and change (positive is worse)
+        for every metric that got worse by more than `tolerance`
+    """
+    current, previous = _flatten(report), _flatten(baseline)
+    regressions = {}
+    for name in sorted(set(current) & set(previous)):
+        if not previous[name]:
+            continue
+        change = current[name] / previous[name] - 1
+        if name.endswith(_HIGHER_IS_BETTER):
+            change = -change
+        if change > tolerance:
+            regressions[name] = {
+                "baseline": previous[name],
+                "current": current[name],
+                "change": change,
+            }
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=500, help="inputs per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default="numpy")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--startup-repeats", type=int, default=3)
+    parser.add_argument("--out", help="also write the report to this file")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.n, args.seed, args.backend, args.repeats, args.startup_repeats
+    )
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Scaling curve for lazydate.Pool: parse_batch throughput from 1 to N worker
+processes, against single-process lazydate.parse_batch. The exact-format parser
+and result cache are disabled so every input reaches the model.
+
+    python -m benchmarks.pool_scaling --rows 20000 --max-workers 32
+"""
+
+import argparse
+import json
+import os
+import time
+
+import lazydate
+
+TEMPLATES = [
+    "payment received {d} dec '{yy:02d} thanks",
+    "{d}./n0vembr/19{yy:02d}",
+    "invoice {d}-aug-19{yy:02d} ref 2231",
+]
+
+
+def _texts(rows: int):
+    return [
+        TEMPLATES[i % len(TEMPLATES)].format(d=i % 28 + 1, yy=i % 100)
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--backend", default="numpy")
+    parser.add_argument("--intra-op-threads", type=int, default=1)
+    args = parser.parse_args()
+
+    texts = _texts(args.rows)
+    lazydate.set_cache_size(0)
+    lazydate.warmup(args.backend)
+
+    start = time.perf_counter()
+    lazydate.parse_batch(texts, exact=False, backend=args.backend)
+    results = {"parse_batch_per_s": args.rows / (time.perf_counter() - start)}
+
+    workers = 1
+    while workers <= args.max_workers:
+        with lazydate.Pool(
+            workers=workers,
+            backend=args.backend,
+            intra_op_threads=args.intra_op_threads,
+        ) as pool:
+            pool.parse_batch(texts[: workers * 4], exact=False)  # warm up workers
+            start = time.perf_counter()
+            pool.parse_batch(texts, exact=False)
+            elapsed = time.perf_counter() - start
+        results[f"pool_{workers}_workers_per_s"] = args.rows / elapsed
+        workers *= 2
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
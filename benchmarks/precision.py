@@ -0,0 +1,85 @@
+"""
+The int8 TensorFlow Lite model against the float32 NumPy backend: accuracy
+delta on held-out generated examples, file size, CPU latency per string and the
+private memory a process adds to load each model and predict a batch.
+
+    python -m benchmarks.precision --n-examples 2000 --batch-size 1 --batch-size 64
+
+The accuracy comparison needs the training data.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from lazydate.models.artifact import UNMASKED_MODEL, artifact_path
+from lazydate.models.quantization import compare_precision, save_int8_model
+
+# Private memory counts pages only this process uses, shared library code and
+# memory-mapped model files in the page cache are not included
+MEMORY_SNIPPET = """
+from lazydate import models
+from lazydate.models.tflite_model import _interpreter_class
+
+
+def private_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        return sum(
+            int(line.split()[1])
+            for line in f
+            if line.startswith(("Private_Clean", "Private_Dirty"))
+        )
+
+
+date_model = getattr(models, {model_class!r})()
+# Import the runtimes first, only the model itself is counted
+_interpreter_class()
+before = private_kb()
+date_model.load_weights({fn!r})
+texts = [f"invoice {{i}} dated {{i % 28 + 1}} march {{1990 + i % 30}}" for i in range(64)]
+date_model.predict_on_batch(texts)
+print(private_kb() - before)
+"""
+
+
+def _private_kb(model_class: str, fn: str) -> int:
+    output = subprocess.run(
+        [sys.executable, "-c", MEMORY_SNIPPET.format(model_class=model_class, fn=fn)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n-examples", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, action="append", dest="batch_sizes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        int8_fn = os.path.join(tmp, "int8.tflite")
+        save_int8_model(int8_fn)
+        results = compare_precision(
+            int8_fn=int8_fn,
+            n_examples=args.n_examples,
+            seed=args.seed,
+            batch_sizes=args.batch_sizes or [1, 64],
+            repeats=args.repeats,
+        )
+        if sys.platform.startswith("linux"):
+            results["float32"]["private_kb"] = _private_kb(
+                "NumpyDateModel", artifact_path(UNMASKED_MODEL)
+            )
+            results["int8"]["private_kb"] = _private_kb("TFLiteDateModel", int8_fn)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
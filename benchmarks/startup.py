@@ -0,0 +1,62 @@
+"""
+Startup benchmark: cold `import lazydate` and time to first parse, each measured
+in a fresh interpreter.
+
+    python -m benchmarks.startup --repeats 5 --backend numpy --backend tensorflow
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import lazydate
+print(time.perf_counter() - start)
+"""
+
+FIRST_PARSE_SNIPPET = """
+import time
+start = time.perf_counter()
+import lazydate
+lazydate.parse("the date is 12th nov 1982", backend={backend!r})
+print(time.perf_counter() - start)
+"""
+
+
+def _time_snippet(snippet: str, repeats: int) -> Dict[str, float]:
+    timings: List[float] = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", snippet],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "max_s": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--backend", action="append", dest="backends")
+    args = parser.parse_args()
+
+    results = {"import": _time_snippet(IMPORT_SNIPPET, args.repeats)}
+    for backend in args.backends or ["numpy"]:
+        snippet = FIRST_PARSE_SNIPPET.format(backend=backend)
+        results[f"first_parse_{backend}"] = _time_snippet(snippet, args.repeats)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,34 @@
 __version__ = "0.1.0"
 
-from .parser import parse, parse_batch
+from .extraction import extract
+from .metrics import set_metrics_sink
+from .parser import (
+    aparse,
+    aparse_batch,
+    cache_info,
+    clear_cache,
+    disable_coalescing,
+    enable_coalescing,
+    parse,
+    parse_batch,
+    parse_stream,
+    path_info,
+    preload,
+    set_cache_size,
+    set_max_pending,
+    set_no_date_gate,
+    warmup,
+)
+
+
+def __getattr__(name: str):
+    # These need numpy (and Pool multiprocessing), only import them when asked for
+    if name == "Pool":
+        from .pool import Pool
+
+        return Pool
+    if name in ("parse_array", "parse_series"):
+        from . import columns
+
+        return getattr(columns, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into batched calls of `fn`.
+
+    A background thread takes the first queued item, then keeps collecting
+    until `max_batch_size` items are queued or `max_wait` seconds have passed,
+    and resolves each caller's future from one call of `fn`.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], List[Any]],
+        max_wait: float = 0.002,
+        max_batch_size: int = 256,
+    ):
+        self.fn = fn
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, item: Any) -> Future:
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed MicroBatcher")
+        future: Future = Future()
+        self._queue.put((item, future))
+        self._ensure_started()
+        return future
+
+    def close(self):
+        """Stop the worker thread once already queued items are processed"""
+        self._closed = True
+        self._queue.put((_STOP, None))
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="lazydate-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> Tuple[List[Tuple[Any, Future]], bool]:
+        """Next batch of (item, future) pairs, and whether close() was reached"""
+        batch: List[Tuple[Any, Future]] = []
+        deadline = None
+        while len(batch) < self.max_batch_size:
+            try:
+                # Take anything already queued, then wait out the window
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                if deadline is None:
+                    timeout = None
+                else:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if entry[0] is _STOP:
+                return batch, True
+            batch.append(entry)
+            if deadline is None:
+                deadline = time.monotonic() + self.max_wait
+        return batch, False
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect()
+            batch = [
+                (item, future)
+                for item, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            try:
+                results = self.fn([item for item, _ in batch])
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, List, NamedTuple, Tuple
+
+MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache. maxsize=0 disables it."""
+
+    def __init__(self, maxsize: int = 65536):
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def reset_lock(self):
+        """New lock, for a forked child where a thread gone with the parent may hold it"""
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> List[Any]:
+        """Look up keys, returning a `MISSING` sentinel for each miss"""
+        results: List[Any] = []
+        with self._lock:
+            for key in keys:
+                value = self._data.get(key, MISSING)
+                if value is MISSING:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+                    self._data.move_to_end(key)
+                results.append(value)
+        return results
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]):
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            for key, value in items:
+                self._data[key] = value
+                self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._maxsize,
+                len(self._data),
+            )
+
+    def _evict(self):
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
+            self._evictions += 1
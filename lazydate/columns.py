@@ -0,0 +1,78 @@
+"""
+Parsing whole dataframe columns.
+
+Columns are factorized first, so the model (and the Python side of
+parse_batch) only sees each distinct value once and the cost scales with the
+column's cardinality rather than its length. pandas and pyarrow are optional:
+pyarrow arrays are dictionary encoded by pyarrow, other inputs are factorized
+with pandas if it is installed and with a dict otherwise.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from lazydate.parser import parse_batch
+
+NAT = np.datetime64("NaT", "ns")
+# Range of datetime64[ns], dates outside it become NaT
+_MIN_NS_DATE = np.datetime64("1677-09-22", "D")
+_MAX_NS_DATE = np.datetime64("2262-04-11", "D")
+
+
+def _is_null(value: Any) -> bool:
+    # NaN is the only value not equal to itself
+    return value is None or value != value
+
+
+def _factorize(values: Any) -> Tuple[np.ndarray, List[Any]]:
+    """:return: index into the unique values per row (-1 for null), and those values"""
+    if hasattr(values, "dictionary_encode"):
+        # pyarrow Array or ChunkedArray
+        if hasattr(values, "combine_chunks"):
+            values = values.combine_chunks()
+        encoded = values.dictionary_encode()
+        codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return codes.astype(np.intp), encoded.dictionary.to_pylist()
+
+    try:
+        import pandas as pd
+    except ImportError:
+        index: Dict[Any, int] = {}
+        codes = np.empty(len(values), dtype=np.intp)
+        for i, value in enumerate(values):
+            codes[i] = -1 if _is_null(value) else index.setdefault(value, len(index))
+        return codes, list(index)
+
+    if not hasattr(values, "dtype"):
+        values = np.array(values, dtype=object)
+    codes, uniques = pd.factorize(values)
+    return codes, list(uniques)
+
+
+def parse_array(values: Any, exact: bool = True, backend: str = "numpy") -> np.ndarray:
+    """
+    :param values: pandas Series, numpy object array, pyarrow string array or
+        any sequence of strings, with None/NaN for nulls
+    :return: datetime64[ns] array, NaT for nulls, no date, and dates outside
+        the datetime64[ns] range
+    """
+    codes, uniques = _factorize(values)
+    dates = parse_batch(
+        [str(u) for u in uniques], exact=exact, backend=backend, as_datetime64=True
+    )
+    in_range = (dates >= _MIN_NS_DATE) & (dates <= _MAX_NS_DATE)
+    dates = np.where(in_range, dates, NAT).astype("datetime64[ns]")
+    # Code -1 (null) picks the trailing NaT
+    return np.append(dates, NAT)[codes]
+
+
+def parse_series(series: Any, exact: bool = True, backend: str = "numpy") -> Any:
+    """parse_array for a pandas Series, keeping its index and name"""
+    import pandas as pd
+
+    return pd.Series(
+        parse_array(series, exact=exact, backend=backend),
+        index=series.index,
+        name=series.name,
+    )
@@ -1 +1,2 @@
 from .data_generation import *
+from .sampling import BatchRandom
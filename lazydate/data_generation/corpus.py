@@ -0,0 +1,124 @@
+"""
+Precomputed training corpus: N generated examples vectorized once and written
+as shards of int32 .npy arrays that lazydate.models.generator.CorpusSequence
+memory-maps for training.
+
+    python -m lazydate.data_generation.corpus data/corpus --n-examples 200000 --seed 0
+
+A directory holds manifest.json and, per shard i, inputs-i.npy (n, 200),
+outputs-i.npy (n, 8) and metadata-i.npz with one column per gen_dict key.
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+
+from lazydate.data_generation.data_generation import generate_dates
+from lazydate.models.config import DIGITS, UNK_TOKEN, VOCABULARY
+from lazydate.models.vectorizer import CharVectorizer
+
+MANIFEST = "manifest.json"
+
+
+def shard_paths(directory: str, shard: int) -> Dict[str, str]:
+    return {
+        name: os.path.join(directory, f"{name}-{shard:05d}.{ext}")
+        for name, ext in [("inputs", "npy"), ("outputs", "npy"), ("metadata", "npz")]
+    }
+
+
+def _metadata_columns(gen_dicts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """gen_dict values as bool, int64 or (for mixed and missing values) str columns"""
+    keys = sorted({key for gen_dict in gen_dicts for key in gen_dict})
+    columns = {}
+    for key in keys:
+        values = [gen_dict.get(key) for gen_dict in gen_dicts]
+        if all(isinstance(v, bool) for v in values):
+            columns[key] = np.array(values, dtype=bool)
+        elif all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            columns[key] = np.array(values, dtype=np.int64)
+        else:
+            columns[key] = np.array(["" if v is None else str(v) for v in values])
+    return columns
+
+
+def write_corpus(
+    directory: str,
+    n_examples: int,
+    shard_size: int = 100000,
+    seed: int = 0,
+    processes: int = 1,
+    no_date_prob: float = 0.1,
+    mask_padding: bool = False,
+):
+    """
+    :param seed: shard i is generated with generate_dates(seed=(seed, i)), so a
+        corpus can be regenerated exactly
+    :param mask_padding: vectorize for a DateModel(mask_padding=True)
+    """
+    input_vectorizer = CharVectorizer(vocabulary=VOCABULARY, mask_padding=mask_padding)
+    output_vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
+    os.makedirs(directory, exist_ok=True)
+
+    shard_sizes = []
+    for shard, start in enumerate(range(0, n_examples, shard_size)):
+        n = min(shard_size, n_examples - start)
+        examples = generate_dates(
+            n, no_date_prob=no_date_prob, seed=(seed, shard), processes=processes
+        )
+        texts = [datestr for datestr, _, _ in examples]
+        targets = [
+            date.strftime("%Y%m%d") if date else UNK_TOKEN * 8
+            for _, date, _ in examples
+        ]
+
+        paths = shard_paths(directory, shard)
+        np.save(paths["inputs"], input_vectorizer.transform(texts).astype(np.int32))
+        np.save(paths["outputs"], output_vectorizer.transform(targets).astype(np.int32))
+        columns: Dict[str, Any] = _metadata_columns([g for _, _, g in examples])
+        np.savez_compressed(paths["metadata"], **columns)
+        shard_sizes.append(n)
+
+    manifest = {
+        "n_examples": n_examples,
+        "shard_sizes": shard_sizes,
+        "seed": seed,
+        "no_date_prob": no_date_prob,
+        "mask_padding": mask_padding,
+        "max_sequence_len": input_vectorizer.max_sequence_len,
+    }
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a sharded training corpus")
+    parser.add_argument("directory")
+    parser.add_argument("--n-examples", type=int, default=200000)
+    parser.add_argument("--shard-size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--no-date-prob", type=float, default=0.1)
+    parser.add_argument("--mask-padding", action="store_true")
+    args = parser.parse_args()
+    write_corpus(
+        args.directory,
+        args.n_examples,
+        shard_size=args.shard_size,
+        seed=args.seed,
+        processes=args.processes,
+        no_date_prob=args.no_date_prob,
+        mask_padding=args.mask_padding,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import datetime
-from typing import Any, Dict, Tuple
+import functools
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import nlpaug.augmenter.char as nac
-import numpy as np
-from babel.dates import format_datetime
+from babel import Locale
+from babel.dates import UTC, DateTimePattern, parse_pattern
 from nltk.tokenize import sent_tokenize
 
 from lazydate.data_generation.config import (
@@ -19,50 +22,111 @@ from lazydate.data_generation.config import (
     WIKIDATA_LOC,
     YEAR_FORMATS, ADDITIONAL_PUNCTUATION,
 )
+from lazydate.data_generation.sampling import BatchRandom
+from lazydate.data_generation.wiki import WikiSentences, index_path
 
 wiki_sentences = None
+# nlpaug augmenters are reused across examples, one per action
+_augmenters: Dict[str, Any] = {}
+# Random source for generate_date calls without one, see _get_default_rng
+_default_rng: Optional[BatchRandom] = None
+
+
+def _get_default_rng() -> BatchRandom:
+    global _default_rng
+    if _default_rng is None:
+        _default_rng = BatchRandom()
+    return _default_rng
+
+
+def _reset_default_rng():
+    # A forked child would otherwise repeat its parent's examples
+    global _default_rng
+    _default_rng = None
+
+
+if hasattr(os, "register_at_fork"):
+    # Not on Windows
+    os.register_at_fork(after_in_child=_reset_default_rng)
 
 
 def load_wikidata_sentences(n_sentences: int = 10000000):
+    """
+    Memory-mapped sentences if the index from `python -m
+    lazydate.data_generation.wiki` exists, otherwise the raw text tokenized in
+    memory
+    """
     global wiki_sentences
     if not wiki_sentences:
-        with open(WIKIDATA_LOC, "r") as f:
-            wikitext = f.read()
-        wiki_sentences = sent_tokenize(wikitext[:n_sentences])
+        if os.path.exists(index_path(WIKIDATA_LOC)):
+            wiki_sentences = WikiSentences(WIKIDATA_LOC)
+        else:
+            with open(WIKIDATA_LOC, "r") as f:
+                wikitext = f.read()
+            wiki_sentences = sent_tokenize(wikitext[:n_sentences])
     return wiki_sentences
 
 
-def random_date(n_years: int = 200) -> Tuple[datetime.datetime, Dict[str, int]]:
+@functools.lru_cache(maxsize=None)
+def _parse_locale(identifier: str) -> Locale:
+    return Locale.parse(identifier)
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_pattern(format_str: str) -> DateTimePattern:
+    return parse_pattern(format_str)
+
+
+def format_datetime(date: datetime.datetime, format_str: str, locale: str) -> str:
+    """babel.dates.format_datetime with locales and patterns parsed once"""
+    return _parse_pattern(format_str).apply(
+        date.replace(tzinfo=UTC), _parse_locale(locale)
+    )
+
+
+def _augmenter(action: str):
+    if action not in _augmenters:
+        _augmenters[action] = nac.RandomCharAug(
+            action=action, aug_char_min=1, aug_char_max=1
+        )
+    return _augmenters[action]
+
+
+def random_date(
+    rng: BatchRandom, n_years: int = 200
+) -> Tuple[datetime.datetime, Dict[str, int]]:
     start_date = datetime.datetime(1900, 1, 1, 0, 0, 0)
     gen_dict = {
-        "days": np.random.randint(0, n_years * 365),
-        "hours": np.random.randint(0, 24),
-        "minutes": np.random.randint(0, 60),
-        "seconds": np.random.randint(0, 60),
+        "days": rng.randint(0, n_years * 365),
+        "hours": rng.randint(0, 24),
+        "minutes": rng.randint(0, 60),
+        "seconds": rng.randint(0, 60),
     }
 
     date = start_date + datetime.timedelta(**gen_dict)
     return date, gen_dict
 
 
-def random_format(date: datetime.datetime) -> Tuple[str, Dict[str, str]]:
+def random_format(
+    date: datetime.datetime, rng: BatchRandom
+) -> Tuple[str, Dict[str, str]]:
     possible_separators = list(SEPARATOR_FREQUENCY.keys())
 
-    reverse_date = np.random.rand() <= 0.3
+    reverse_date = rng.rand() <= 0.3
     current_year = datetime.datetime.now().year
     if not reverse_date and current_year - 80 <= date.year <= current_year + 20:
-        year_format = np.random.choice(YEAR_FORMATS)
+        year_format = rng.choice(YEAR_FORMATS)
     else:
         year_format = "yyyy"
 
-    append_time = np.random.rand() <= 0.5
-    drop_day = date.day == 1 and np.random.rand() <= 0.3
-    month_format = np.random.choice(MONTH_FORMATS)
+    append_time = rng.rand() <= 0.5
+    drop_day = date.day == 1 and rng.rand() <= 0.3
+    month_format = rng.choice(MONTH_FORMATS)
     gen_dict = {
-        "day": np.random.choice(DAY_FORMATS),
+        "day": rng.choice(DAY_FORMATS),
         "month": month_format,
         "year": year_format,
-        "separator": np.random.choice(
+        "separator": rng.choice(
             possible_separators, p=list(SEPARATOR_FREQUENCY.values())
         ),
         "append_time": append_time,
@@ -70,16 +134,16 @@ def random_format(date: datetime.datetime) -> Tuple[str, Dict[str, str]]:
         "reverse_date": reverse_date,
     }
     gen_dict["reverse_str_month_day"] = (
-        np.random.rand() <= 0.3 and len(month_format) > 2
+        rng.rand() <= 0.3 and len(month_format) > 2
     )
 
     if append_time:
         time_gen_dict = {
-            "second": np.random.choice(SECOND_FORMATS),
-            "minute": np.random.choice(MINUTE_FORMATS),
-            "hour": np.random.choice(HOUR_FORMATS),
-            "timezone": np.random.choice(TIMEZONE_FORMATS),
-            "time_separator": np.random.choice(TIME_SEPARATORS),
+            "second": rng.choice(SECOND_FORMATS),
+            "minute": rng.choice(MINUTE_FORMATS),
+            "hour": rng.choice(HOUR_FORMATS),
+            "timezone": rng.choice(TIMEZONE_FORMATS),
+            "time_separator": rng.choice(TIME_SEPARATORS),
         }
     else:
         time_gen_dict = {
@@ -89,7 +153,7 @@ def random_format(date: datetime.datetime) -> Tuple[str, Dict[str, str]]:
 
     sep = gen_dict["separator"]
     if sep != "''" and gen_dict["year"] == "yy":
-        if np.random.random() <= 0.5:
+        if rng.random() <= 0.5:
             gen_dict["year"] = "''" + gen_dict["year"]
 
     if drop_day:
@@ -111,11 +175,11 @@ def random_format(date: datetime.datetime) -> Tuple[str, Dict[str, str]]:
     if append_time and not reverse_date:
         sep = gen_dict["time_separator"]
         format_time_str = f" {gen_dict['hour']}{sep}{gen_dict['minute']}"
-        if np.random.random() <= 0.5:
+        if rng.random() <= 0.5:
             format_time_str += f"{sep}{gen_dict['second']}"
-        if np.random.random() <= 0.5:
+        if rng.random() <= 0.5:
             format_time_str += f" a"  # AM / PM
-        if np.random.random() <= 0.5:
+        if rng.random() <= 0.5:
             format_time_str += f" {gen_dict['timezone']}"
 
     format_str = format_date_str + format_time_str
@@ -123,20 +187,20 @@ def random_format(date: datetime.datetime) -> Tuple[str, Dict[str, str]]:
     return format_str, gen_dict
 
 
-def get_random_wiki_sentence(max_length: int = 150) -> str:
+def get_random_wiki_sentence(rng: BatchRandom, max_length: int = 150) -> str:
     wiki_sentences = load_wikidata_sentences()
-    idx = np.random.randint(0, len(wiki_sentences))
+    idx = rng.randint(0, len(wiki_sentences))
     return wiki_sentences[idx][:max_length]
 
 
 def random_noise_dict(
-    date: datetime.datetime, format_dict: Dict[str, str]
+    date: datetime.datetime, format_dict: Dict[str, str], rng: BatchRandom
 ) -> Dict[str, str]:
-    append_day_suffix = format_dict["day"] == "dd" and np.random.random() <= 0.5
-    place_in_sentence = np.random.random() <= 0.5
+    append_day_suffix = format_dict["day"] == "dd" and rng.random() <= 0.5
+    place_in_sentence = rng.random() <= 0.5
 
     # TODO: add noise to end of string without separator
-    casing_rand_val = np.random.rand()
+    casing_rand_val = rng.rand()
     casing = None
     if casing_rand_val <= 0.15:
         casing = "uppercase"
@@ -144,13 +208,13 @@ def random_noise_dict(
         casing = "lowercase"
 
     gen_dict = {
-        "locale": np.random.choice(LOCALES),
+        "locale": rng.choice(LOCALES),
         "append_day_suffix": append_day_suffix,
-        "aug_char_action": np.random.choice(["insert", "substitute"]),
+        "aug_char_action": rng.choice(["insert", "substitute"]),
         "place_in_sentence": place_in_sentence,
-        "sentence": get_random_wiki_sentence() if place_in_sentence else "",
+        "sentence": get_random_wiki_sentence(rng) if place_in_sentence else "",
         "casing": casing,
-        "noisy_separator": np.random.random() <= 0.3,
+        "noisy_separator": rng.random() <= 0.3,
     }
 
     day_suffix = ""
@@ -168,15 +232,18 @@ def random_noise_dict(
     return gen_dict
 
 
-def put_datestr_in_sentence(datestr: str, sentence: str):
+def put_datestr_in_sentence(datestr: str, sentence: str, rng: BatchRandom):
     split_sentence = sentence.split(" ")
-    idx = np.random.randint(0, len(split_sentence))
+    idx = rng.randint(0, len(split_sentence))
     split_sentence[idx] = datestr
     return " ".join(split_sentence)
 
 
 def apply_noise(
-    datestr: str, format_dict: Dict[str, str], noise_dict: Dict[str, Any]
+    datestr: str,
+    format_dict: Dict[str, str],
+    noise_dict: Dict[str, Any],
+    rng: BatchRandom,
 ) -> str:
     sep = format_dict["separator"]
     sep = sep[0] if len(sep) > 1 else sep
@@ -186,24 +253,28 @@ def apply_noise(
         date_parts[0] = date_parts[0] + noise_dict["day_suffix"]
 
     # Add spelling mistake to month name
-    if len(format_dict["month"]) > 2 and np.random.random() <= 0.3:
-        aug = nac.RandomCharAug(
-            action=noise_dict["aug_char_action"],
-            aug_char_min=1,
-            aug_char_max=1,
-        )
-        date_parts[1] = aug.augment(date_parts[1])
+    if len(format_dict["month"]) > 2 and rng.random() <= 0.3:
+        with rng.python_random():
+            augmented = _augmenter(noise_dict["aug_char_action"]).augment(
+                date_parts[1]
+            )
+        # nlpaug >= 1.0 returns a list of augmented texts
+        if isinstance(augmented, list):
+            augmented = augmented[0]
+        date_parts[1] = augmented
 
     out = ""
     for idx, date_part in enumerate(date_parts):
         part_sep = sep
-        rand_val = np.random.random()
+        rand_val = rng.random()
         if noise_dict["noisy_separator"] and rand_val <= 0.15:
             part_sep += " "
         if noise_dict["noisy_separator"] and rand_val <= 0.15:
             part_sep = " " + part_sep
         elif noise_dict["noisy_separator"] and rand_val <= 0.5:
-            part_sep += "".join(np.random.choice(ADDITIONAL_PUNCTUATION, size=2))
+            part_sep += rng.choice(ADDITIONAL_PUNCTUATION) + rng.choice(
+                ADDITIONAL_PUNCTUATION
+            )
 
         if idx == 0:
             out += date_part
@@ -217,24 +288,25 @@ def apply_noise(
         out = out.lower()
 
     if noise_dict["place_in_sentence"]:
-        out = put_datestr_in_sentence(out, noise_dict["sentence"])
+        out = put_datestr_in_sentence(out, noise_dict["sentence"], rng)
 
     return out
 
 
 def generate_date(
-    no_date_prob: float = 0.1,
+    no_date_prob: float = 0.1, rng: Optional[BatchRandom] = None
 ) -> Tuple[str, datetime.datetime, Dict[str, Any]]:
-    date, date_gen_dict = random_date()
-    format_str, format_gen_dict = random_format(date)
-    noise_gen_dict = random_noise_dict(date, format_gen_dict)
-
-    datestr = format_datetime(
-        date,
-        format=format_str,
-        locale=noise_gen_dict["locale"],
-    )
-    datestr = apply_noise(datestr, format_gen_dict, noise_gen_dict)
+    """
+    :param rng: random source, pass BatchRandom(seed) for reproducible examples.
+        Otherwise a module-level one, unseeded, is shared between calls
+    """
+    rng = rng or _get_default_rng()
+    date, date_gen_dict = random_date(rng)
+    format_str, format_gen_dict = random_format(date, rng)
+    noise_gen_dict = random_noise_dict(date, format_gen_dict, rng)
+
+    datestr = format_datetime(date, format_str, noise_gen_dict["locale"])
+    datestr = apply_noise(datestr, format_gen_dict, noise_gen_dict, rng)
 
     gen_dict = date_gen_dict
     gen_dict.update(format_gen_dict)
@@ -242,9 +314,47 @@ def generate_date(
     gen_dict["no_date"] = False
 
     # Example with no date
-    if np.random.random() <= no_date_prob:
+    if rng.random() <= no_date_prob:
         date = None
-        datestr = get_random_wiki_sentence()
+        datestr = get_random_wiki_sentence(rng)
         gen_dict["no_date"] = True
 
     return datestr, date, gen_dict
+
+
+def _generate_chunk(args: Tuple[int, float, Any, int]) -> List[Tuple]:
+    n, no_date_prob, seed, chunk_idx = args
+    if seed is None:
+        rng = BatchRandom()
+    else:
+        rng = BatchRandom((*(seed if isinstance(seed, tuple) else (seed,)), chunk_idx))
+    return [generate_date(no_date_prob, rng) for _ in range(n)]
+
+
+def generate_dates(
+    n: int,
+    no_date_prob: float = 0.1,
+    seed: Optional[Union[int, Tuple[int, ...]]] = None,
+    processes: int = 1,
+    chunk_size: int = 1024,
+) -> List[Tuple[str, datetime.datetime, Dict[str, Any]]]:
+    """
+    `n` examples as from generate_date. Chunk i is drawn from BatchRandom((seed,
+    i)), so with a seed the output is the same for any number of processes.
+
+    :param seed: int or tuple of ints, e.g. (seed, shard)
+    :param processes: worker processes, generation is CPU bound and holds the GIL
+    """
+    chunks = [
+        (min(chunk_size, n - start), no_date_prob, seed, idx)
+        for idx, start in enumerate(range(0, n, chunk_size))
+    ]
+    if processes <= 1:
+        return [example for chunk in chunks for example in _generate_chunk(chunk)]
+
+    # Load sentences before starting workers, so forked workers inherit them
+    load_wikidata_sentences()
+    with multiprocessing.Pool(processes) as pool:
+        return [
+            example for chunk in pool.imap(_generate_chunk, chunks) for example in chunk
+        ]
@@ -0,0 +1,63 @@
+import bisect
+import random
+from contextlib import contextmanager
+from itertools import accumulate
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+
+class BatchRandom:
+    """
+    Random source for data generation. Uniform floats are drawn from a seeded
+    RandomState in blocks and handed out one at a time, which avoids the
+    per-call overhead of scalar np.random calls (np.random.choice on a list
+    converts it to an array every time).
+
+    nlpaug draws from the global `random` module, so augmentations run inside
+    python_random(), which seeds it from this source and restores the caller's
+    state afterwards.
+    """
+
+    def __init__(self, seed: Optional[Any] = None, block_size: int = 4096):
+        """
+        :param seed: anything np.random.RandomState accepts, e.g. an int or a
+            sequence of ints such as (seed, worker, batch)
+        """
+        self._rng = np.random.RandomState(seed)
+        self.block_size = block_size
+        self._block: list = []
+        self._pos = 0
+
+    def random(self) -> float:
+        if self._pos == len(self._block):
+            self._block = self._rng.random_sample(self.block_size).tolist()
+            self._pos = 0
+        value = self._block[self._pos]
+        self._pos += 1
+        return value
+
+    rand = random
+
+    def randint(self, low: int, high: int) -> int:
+        """Integer in [low, high)"""
+        return low + int(self.random() * (high - low))
+
+    def choice(
+        self, options: Sequence[Any], p: Optional[Sequence[float]] = None
+    ) -> Any:
+        if p is None:
+            return options[int(self.random() * len(options))]
+        cumulative = list(accumulate(p))
+        idx = bisect.bisect_right(cumulative, self.random() * cumulative[-1])
+        return options[min(idx, len(options) - 1)]
+
+    @contextmanager
+    def python_random(self) -> Iterator[None]:
+        """Seed the global `random` module for the block, then restore its state"""
+        state = random.getstate()
+        random.seed(self.randint(0, 2**31))
+        try:
+            yield
+        finally:
+            random.setstate(state)
@@ -0,0 +1,99 @@
+"""
+Wikipedia sentences used as noise around and instead of dates.
+
+Tokenizing the raw text takes minutes, so it is done once:
+
+    python -m lazydate.data_generation.wiki data/wiki.train.raw
+
+writes the (start, end) byte offset of every sentence to an int64 .npy index
+next to the raw file. WikiSentences memory-maps both, so opening it is
+near-instant and forked or spawned workers share the page cache rather than
+each holding a copy of the sentences.
+"""
+
+import argparse
+import mmap
+import os
+from typing import Optional
+
+import numpy as np
+
+from lazydate.data_generation.config import WIKIDATA_LOC
+
+# The text sent_tokenize has always been run on
+MAX_CHARS = 10000000
+
+
+def index_path(raw_path: str) -> str:
+    return os.path.splitext(raw_path)[0] + ".idx.npy"
+
+
+def _punkt_tokenizer(language: str = "english"):
+    """The PunktSentenceTokenizer sent_tokenize uses for `language`"""
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+    except ImportError:
+        # nltk < 3.8.2 ships the models pickled
+        import nltk
+
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+    return PunktTokenizer(language)
+
+
+def build_index(
+    raw_path: str = WIKIDATA_LOC,
+    out_path: Optional[str] = None,
+    max_chars: int = MAX_CHARS,
+) -> np.ndarray:
+    """
+    :param max_chars: tokenize only the first max_chars characters
+    :return: (n_sentences, 2) int64 byte offsets, also saved to out_path
+        (default index_path(raw_path))
+    """
+    # Without newline="" "\r\n" would be read as one character, and the byte
+    # offsets would drift by one per line ending
+    with open(raw_path, "r", encoding="utf-8", newline="") as f:
+        text = f.read(max_chars)
+
+    offsets = []
+    # Punkt spans are character offsets, the mmap is sliced by bytes
+    char_pos = byte_pos = 0
+    for start, end in _punkt_tokenizer().span_tokenize(text):
+        byte_start = byte_pos + len(text[char_pos:start].encode("utf-8"))
+        byte_end = byte_start + len(text[start:end].encode("utf-8"))
+        offsets.append((byte_start, byte_end))
+        char_pos, byte_pos = end, byte_end
+
+    index = np.array(offsets, dtype=np.int64).reshape(-1, 2)
+    np.save(out_path or index_path(raw_path), index)
+    return index
+
+
+class WikiSentences:
+    """Read-only sequence of the sentences of an indexed raw file"""
+
+    def __init__(self, raw_path: str = WIKIDATA_LOC, index: Optional[str] = None):
+        self._offsets = np.load(index or index_path(raw_path), mmap_mode="r")
+        with open(raw_path, "rb") as f:
+            self._text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, idx: int) -> str:
+        start, end = self._offsets[idx]
+        return self._text[start:end].decode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the sentences of a raw file")
+    parser.add_argument("raw_path", nargs="?", default=WIKIDATA_LOC)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--max-chars", type=int, default=MAX_CHARS)
+    args = parser.parse_args()
+    index = build_index(args.raw_path, args.out, max_chars=args.max_chars)
+    print(f"Indexed {len(index)} sentences")
+
+
+if __name__ == "__main__":
+    main()
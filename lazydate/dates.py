@@ -0,0 +1,61 @@
+"""
+Bulk conversion of "%Y%m%d" model outputs to dates.
+
+Year, month and day are computed arithmetically from the character codes of
+the whole batch at once and validated together, so an invalid output such as
+"20201399" becomes a missing date rather than an exception.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_PLACE_VALUES = np.array([1000, 100, 10, 1, 10, 1, 10, 1])
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def date_parts(
+    datestrs: List[str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param datestrs: "%Y%m%d" strings, "" for no date
+    :return: (n,) years, months, days and whether each is a valid date
+    """
+    # Each string is 8 UCS4 code points, shorter ones are zero padded
+    codes = np.array(datestrs, dtype="U8").view(np.uint32).reshape(-1, 8)
+    digits = codes.astype(np.int64) - ord("0")
+    valid = np.all((digits >= 0) & (digits <= 9), axis=1)
+
+    values = digits * _PLACE_VALUES
+    years = values[:, :4].sum(axis=1)
+    months = values[:, 4:6].sum(axis=1)
+    days = values[:, 6:].sum(axis=1)
+
+    is_leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    month_length = _DAYS_IN_MONTH[np.clip(months, 0, 12)] + (is_leap & (months == 2))
+    valid &= (years >= 1) & (months >= 1) & (months <= 12)
+    valid &= (days >= 1) & (days <= month_length)
+    return years, months, days, valid
+
+
+def to_datetime64(datestrs: List[str]) -> np.ndarray:
+    """:return: (n,) datetime64[D] array, NaT for no date or invalid outputs"""
+    years, months, days, valid = date_parts(datestrs)
+    month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    dates = month_starts.astype("datetime64[D]") + (days - 1)
+    dates[~valid] = np.datetime64("NaT")
+    return dates
+
+
+def to_datetimes(datestrs: List[str]) -> List[Optional[datetime]]:
+    """:return: datetimes, None for no date or invalid outputs"""
+    if len(datestrs) == 0:
+        return []
+    years, months, days, valid = date_parts(datestrs)
+    return [
+        datetime(y, m, d) if v else None
+        for y, m, d, v in zip(
+            years.tolist(), months.tolist(), days.tolist(), valid.tolist()
+        )
+    ]
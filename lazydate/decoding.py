@@ -0,0 +1,166 @@
+"""
+Calendar-constrained decoding of the model's per-position output probabilities.
+
+The model emits 8 independent distributions over the digits plus UNK, and the
+argmax string is not always a real date ("20201399"). Here every candidate is
+scored by the product of its per-position probabilities and only valid dates
+(years 1-9999, months 1-12, days valid for the month and leap year) and the
+all-UNK "no date" output compete for the top k.
+
+A date's score splits into a year term (positions 0-3) and a month-day term
+(positions 4-7), which only interact through 29 February. The best k dates
+therefore have their year among the k best years, or among the k best leap
+years for 29 February. Each year term is in turn the sum of a century and a
+year-in-century term, so the k best years are found among pairs of the k + 1
+best of each half and no row ever scores all 10000 years.
+"""
+
+import calendar
+from typing import List, Tuple
+
+import numpy as np
+
+from lazydate.models.config import OUTPUT_SEQUENCE_LEN
+
+N_DIGITS = 10
+# Rows decoded at once, bounds the (rows, k * 366) candidate scores
+CHUNK_SIZE = 1024
+
+
+def _month_days() -> np.ndarray:
+    """(366, 4) digits of every MMDD in a leap year, 29 February last"""
+    month_days = [
+        f"{month:02d}{day:02d}"
+        for month in range(1, 13)
+        for day in range(1, calendar.monthrange(2000, month)[1] + 1)
+        if (month, day) != (2, 29)
+    ]
+    month_days.append("0229")
+    return np.array([[int(c) for c in md] for md in month_days])
+
+
+_MONTH_DAYS = _month_days()
+_MONTH_DAY_VALUES = _MONTH_DAYS @ np.array([1000, 100, 10, 1])
+_HUNDRED = np.arange(100)
+
+
+def top_k_dates(proba: np.ndarray, k: int = 1) -> Tuple[List[List[str]], np.ndarray]:
+    """
+    :param proba: (n, 8, 11) output probabilities, digits 0-9 then UNK
+    :param k: candidates per row, 1 to 100
+    :return: (n, k) "%Y%m%d" date strings ("" for no date), best first, and the
+        (n, k) probability of each
+    """
+    if not 1 <= k <= 100:
+        raise ValueError(f"k must be between 1 and 100, got {k}")
+    if proba.shape[1:] != (OUTPUT_SEQUENCE_LEN, N_DIGITS + 1):
+        raise ValueError(
+            f"Expected (n, {OUTPUT_SEQUENCE_LEN}, {N_DIGITS + 1}) probabilities, "
+            f"got {proba.shape}"
+        )
+    datestrs: List[List[str]] = []
+    confidences = np.zeros((len(proba), k), dtype=np.float64)
+    for start in range(0, len(proba), CHUNK_SIZE):
+        chunk_datestrs, chunk_confidences = _top_k_chunk(
+            proba[start : start + CHUNK_SIZE], k
+        )
+        datestrs += chunk_datestrs
+        confidences[start : start + len(chunk_datestrs)] = chunk_confidences
+    return datestrs, confidences
+
+
+def _top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k highest scores per row, unordered"""
+    k = min(k, scores.shape[1])
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def _top_k_years(
+    century: np.ndarray, year_in_century: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param century: (n, 100) scores of the first two year digits
+    :param year_in_century: (n, 100) scores of the last two
+    :return: (n, k) years among the k best (year 0 excluded) and their scores
+    """
+    rows = np.arange(len(century))[:, None]
+    top_centuries = _top_k_rows(century, k + 1)
+    top_year_in_century = _top_k_rows(year_in_century, k + 1)
+    years = (top_centuries[:, :, None] * 100 + top_year_in_century[:, None, :]).reshape(
+        len(century), -1
+    )
+    scores = (
+        century[rows, top_centuries][:, :, None]
+        + year_in_century[rows, top_year_in_century][:, None, :]
+    ).reshape(len(century), -1)
+    scores[years == 0] = -np.inf
+    best = _top_k_rows(scores, k)
+    return years[rows, best], scores[rows, best]
+
+
+def _top_k_leap_years(
+    century: np.ndarray, year_in_century: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """As _top_k_years for leap years only"""
+    # Leap years are xx04, xx08, ..., xx96 for any century, or yy00 where yy is
+    # a multiple of 4
+    not_multiple_of_4 = (_HUNDRED % 4 != 0) | (_HUNDRED == 0)
+    years, scores = _top_k_years(
+        century, np.where(not_multiple_of_4, -np.inf, year_in_century), k
+    )
+    top_centuries = _top_k_rows(np.where(_HUNDRED % 4 != 0, -np.inf, century), k + 1)
+    rows = np.arange(len(century))[:, None]
+    century_years = top_centuries * 100
+    century_scores = century[rows, top_centuries] + year_in_century[:, :1]
+    century_scores[century_years == 0] = -np.inf
+
+    years = np.concatenate([years, century_years], axis=1)
+    scores = np.concatenate([scores, century_scores], axis=1)
+    best = _top_k_rows(scores, k)
+    return years[rows, best], scores[rows, best]
+
+
+def _top_k_chunk(proba: np.ndarray, k: int) -> Tuple[List[List[str]], np.ndarray]:
+    n = len(proba)
+    log_proba = np.log(np.maximum(proba.astype(np.float64), 1e-30))
+    digits = log_proba[:, :, :N_DIGITS]
+
+    century = (digits[:, 0, :, None] + digits[:, 1, None, :]).reshape(n, 100)
+    year_in_century = (digits[:, 2, :, None] + digits[:, 3, None, :]).reshape(n, 100)
+    top_years, year_scores = _top_k_years(century, year_in_century, k)
+    leap_years, leap_year_scores = _top_k_leap_years(century, year_in_century, k)
+
+    # (n, 366) score of every month-day pair
+    md_scores = digits[:, 4, _MONTH_DAYS[:, 0]]
+    for i in range(1, 4):
+        md_scores = md_scores + digits[:, 4 + i, _MONTH_DAYS[:, i]]
+
+    # Candidates: k years x 365 month-days, k leap years x 29 February, no date
+    scores = np.concatenate(
+        [
+            (year_scores[:, :, None] + md_scores[:, None, :-1]).reshape(n, -1),
+            leap_year_scores + md_scores[:, -1:],
+            log_proba[:, :, N_DIGITS].sum(axis=1, keepdims=True),
+        ],
+        axis=1,
+    )
+    values = np.concatenate(
+        [
+            (top_years[:, :, None] * 10000 + _MONTH_DAY_VALUES[:-1]).reshape(n, -1),
+            leap_years * 10000 + _MONTH_DAY_VALUES[-1],
+            np.zeros((n, 1), dtype=int),
+        ],
+        axis=1,
+    )
+
+    rows = np.arange(n)[:, None]
+    best = _top_k_rows(scores, k)
+    best = np.take_along_axis(
+        best, np.argsort(-scores[rows, best], axis=1, kind="stable"), axis=1
+    )
+    confidences = np.exp(scores[rows, best])
+    datestrs = [
+        [f"{value:08d}" if value else "" for value in row]
+        for row in values[rows, best].tolist()
+    ]
+    return datestrs, confidences
@@ -0,0 +1,90 @@
+"""
+Deterministic parser for clean, unambiguous date strings.
+
+Mirrors the formats the model is trained on in lazydate.data_generation:
+day-first numeric dates, year-first dates with a four digit year, English
+month names (optionally month-first or without a day) and a single separator
+from SEPARATOR_FREQUENCY used consistently. Anything else is left to the model.
+"""
+
+import calendar
+import re
+from typing import Optional
+
+# Month names used by the en_* babel locales, wide and abbreviated
+MONTH_NAMES = {
+    "january": 1,
+    "jan": 1,
+    "february": 2,
+    "feb": 2,
+    "march": 3,
+    "mar": 3,
+    "april": 4,
+    "apr": 4,
+    "may": 5,
+    "june": 6,
+    "jun": 6,
+    "july": 7,
+    "jul": 7,
+    "august": 8,
+    "aug": 8,
+    "september": 9,
+    "sept": 9,
+    "sep": 9,
+    "october": 10,
+    "oct": 10,
+    "november": 11,
+    "nov": 11,
+    "december": 12,
+    "dec": 12,
+}
+
+# Two digit years are generated for dates within (current year - 80, current year + 20)
+# of the training run, so "39" -> 2039 and "40" -> 1940
+TWO_DIGIT_YEAR_PIVOT = 40
+
+_MONTH_NAME = "|".join(sorted(MONTH_NAMES, key=len, reverse=True))
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+_MONTH = rf"(?P<month>\d{{1,2}}|{_MONTH_NAME})"
+_YEAR = r"(?P<year>\d{4}|'?\d{2})"
+# babel renders the "''" separator as a single quote
+_SEP = r"(?P<sep>'|[.,/-] ?| )"
+
+_PATTERNS = [
+    re.compile(rf"{_DAY}{_SEP}{_MONTH}(?P=sep){_YEAR}"),
+    re.compile(rf"(?P<year>\d{{4}}){_SEP}{_MONTH}(?P=sep){_DAY}"),
+    re.compile(rf"(?P<month>{_MONTH_NAME}){_SEP}{_DAY}(?P=sep){_YEAR}"),
+    re.compile(rf"(?P<month>{_MONTH_NAME}){_SEP}{_YEAR}"),
+]
+
+
+def parse_exact(text: str) -> Optional[str]:
+    """
+    :return: "%Y%m%d" date string if text is a clean date in a known format,
+        otherwise None (including for calendar-invalid dates)
+    """
+    text = text.strip().lower()
+    for pattern in _PATTERNS:
+        match = pattern.fullmatch(text)
+        if match:
+            return _to_datestr(match)
+    return None
+
+
+def _to_datestr(match: "re.Match") -> Optional[str]:
+    groups = match.groupdict()
+
+    year_str = groups["year"].lstrip("'")
+    year = int(year_str)
+    if len(year_str) == 2:
+        year += 2000 if year < TWO_DIGIT_YEAR_PIVOT else 1900
+
+    month_str = groups["month"]
+    month = int(month_str) if month_str.isdigit() else MONTH_NAMES[month_str]
+    day = int(groups.get("day") or 1)
+
+    if year < 1 or not 1 <= month <= 12:
+        return None
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return f"{year:04d}{month:02d}{day:02d}"
@@ -0,0 +1,89 @@
+"""
+Date extraction from documents of any length.
+
+Runs of date-like tokens (words containing a digit, month names and
+misspellings of them) separated by at most MAX_GAP characters are candidate
+mentions, and everything else is skipped without running the model. Each
+candidate, with `context` characters of surrounding text, is one model input,
+and all of a document's windows go through parse_batch together. The model is trained on short strings containing
+a single date: wide windows that take in neighbouring mentions make it report
+the wrong one, so by default the windows are the candidates alone.
+"""
+
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Tuple
+
+from lazydate.exact import MONTH_NAMES
+from lazydate.models.config import MAX_SEQUENCE_LEN
+
+# Longest run of non-token characters inside one mention, e.g. " of "
+MAX_GAP = 4
+
+# A word starting like a month name, up to the length of "september", so that
+# misspelled months ("decembr") don't split a mention
+_MONTH_WORD = (
+    r"\b(?:" + "|".join(sorted({m[:3] for m in MONTH_NAMES})) + r")[a-z]{0,6}\b"
+)
+_TOKEN = re.compile(r"'?\w*\d\w*|" + _MONTH_WORD, re.IGNORECASE)
+
+
+class Extraction(NamedTuple):
+    date: datetime
+    start: int
+    end: int
+
+
+def _candidates(text: str) -> List[Tuple[int, int]]:
+    """(start, end) spans of runs of date-like tokens"""
+    spans: List[List[int]] = []
+    for match in _TOKEN.finditer(text):
+        start, end = match.span()
+        if (
+            spans
+            and start - spans[-1][1] <= MAX_GAP
+            and end - spans[-1][0] <= MAX_SEQUENCE_LEN
+        ):
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+    return [(start, end) for start, end in spans]
+
+
+def extract(
+    text: str, context: int = 0, exact: bool = True, backend: str = "numpy"
+) -> List[Extraction]:
+    """
+    Every date mentioned in `text`, in order, with its character span
+
+    :param context: characters of surrounding text either side of a candidate
+        mention passed to the model
+    :param exact: resolve clean dates with the exact-format parser
+    """
+    from lazydate.parser import parse_batch
+
+    spans = _candidates(text)
+    windows = []
+    for start, end in spans:
+        margin = max(min(context, (MAX_SEQUENCE_LEN - (end - start)) // 2), 0)
+        windows.append((max(start - margin, 0), end + margin))
+    dates = parse_batch(
+        [text[start:end] for start, end in windows], exact=exact, backend=backend
+    )
+
+    # With context, adjacent windows overlap and can both see the same mention
+    extractions: List[Extraction] = []
+    last_window_end = -1
+    for (start, end), (window_start, window_end), date in zip(spans, windows, dates):
+        if date is None:
+            continue
+        if (
+            extractions
+            and extractions[-1].date == date
+            and window_start < last_window_end
+        ):
+            extractions[-1] = extractions[-1]._replace(end=end)
+        else:
+            extractions.append(Extraction(date, start, end))
+        last_window_end = window_end
+    return extractions
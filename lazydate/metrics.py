@@ -0,0 +1,207 @@
+"""
+Opt-in instrumentation of the parse pipeline.
+
+Install a sink with lazydate.set_metrics_sink(sink) and the parser reports:
+
+- lazydate_stage_seconds{stage=...}: histogram of time per batch in each stage,
+  "exact" (exact-format parser and cache lookups), "vectorize", "predict"
+  (the model), "decode" (model outputs to date strings or top-k dates) and
+  "convert" (date strings to datetimes)
+- lazydate_batch_size: histogram of inputs per batch
+- lazydate_input_length: histogram of input lengths in characters
+- lazydate_truncated_inputs_total: inputs longer than MAX_SEQUENCE_LEN
+- lazydate_gated_inputs_total: inputs answered by the no-date gate without
+  running the model
+- lazydate_inputs_total, lazydate_no_date_inputs_total: parsed inputs, and
+  those without a date
+- lazydate_model_load_seconds{backend=...}: histogram of model load times
+
+Without a sink every instrumentation point is a single `is None` check.
+PrometheusSink keeps the metrics in memory and renders (or serves) them in the
+Prometheus text format, any other backend can implement MetricsSink.
+"""
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+Labels = Optional[Dict[str, str]]
+
+TIME_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = tuple(2**i for i in range(17))
+
+_sink: Optional["MetricsSink"] = None
+
+
+class MetricsSink(ABC):
+    """Receives metrics from the parser. Methods may be called from any thread."""
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: Labels = None):
+        """Record one value of the histogram `name`"""
+
+    def observe_many(self, name: str, values: Iterable[float], labels: Labels = None):
+        for value in values:
+            self.observe(name, value, labels)
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1.0, labels: Labels = None):
+        """Add `value` to the counter `name`"""
+
+    def after_fork(self):
+        """
+        Called in forked children of a process using this sink. Override to
+        recreate locks, a thread in the parent may have held them at fork().
+        """
+
+
+def set_metrics_sink(sink: Optional[MetricsSink]):
+    """Send parser metrics to `sink`, or stop collecting them with None"""
+    global _sink
+    _sink = sink
+
+
+def get_metrics_sink() -> Optional[MetricsSink]:
+    return _sink
+
+
+def _label_key(labels: Labels) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...]) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Non-cumulative, the last slot counts values above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class PrometheusSink(MetricsSink):
+    """
+    In-memory counters and histograms rendered in the Prometheus text format.
+    Histograms of *_seconds metrics use TIME_BUCKETS, the rest SIZE_BUCKETS.
+    """
+
+    def __init__(self, buckets: Optional[Dict[str, Tuple[float, ...]]] = None):
+        """
+        :param buckets: upper bounds per histogram name, overriding the defaults
+        """
+        self._buckets = buckets or {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, _Histogram]] = {}
+
+    def after_fork(self):
+        # The serve() thread may have been rendering when the parent forked
+        self._lock = threading.Lock()
+
+    def _histogram(self, name: str, labels: Labels) -> _Histogram:
+        series = self._histograms.setdefault(name, {})
+        key = _label_key(labels)
+        if key not in series:
+            default = TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+            series[key] = _Histogram(self._buckets.get(name, default))
+        return series[key]
+
+    def observe(self, name: str, value: float, labels: Labels = None):
+        with self._lock:
+            self._histogram(name, labels).observe(value)
+
+    def observe_many(self, name: str, values: Iterable[float], labels: Labels = None):
+        with self._lock:
+            histogram = self._histogram(name, labels)
+            for value in values:
+                histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1.0, labels: Labels = None):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, histograms in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    for bound, count in zip(
+                        [*histogram.buckets, "+Inf"], histogram.counts
+                    ):
+                        cumulative += count
+                        le = bound if bound == "+Inf" else f"{bound:g}"
+                        bucket_key = key + (("le", le),)
+                        lines.append(
+                            f"{name}_bucket{_format_labels(bucket_key)} {cumulative}"
+                        )
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_sum{labels} {histogram.sum:g}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, addr: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serve render() at http://addr:port/metrics from a daemon thread
+
+        :return: the server, stop it with server.shutdown()
+        """
+        # Imported here, http.server would add noticeably to `import lazydate`
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="lazydate-metrics", daemon=True
+        )
+        thread.start()
+        return server
@@ -1 +1,16 @@
-from .date_model import DateModel
+def __getattr__(name: str):
+    # Model classes are imported on first use: DateModel needs TensorFlow and
+    # NumpyDateModel needs numpy, neither of which `import lazydate` should pay for
+    if name == "DateModel":
+        from .date_model import DateModel
+
+        return DateModel
+    if name == "NumpyDateModel":
+        from .numpy_model import NumpyDateModel
+
+        return NumpyDateModel
+    if name == "TFLiteDateModel":
+        from .tflite_model import TFLiteDateModel
+
+        return TFLiteDateModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+"""
+Versioned model artifacts shipped as package data.
+
+An artifact is a directory holding manifest.json (format version, architecture,
+vocabularies, sequence lengths and array names) and one uncompressed float32
+.npy file per weight array, named as in numpy_model.weight_names.
+Uncompressed .npy files can be memory-mapped, so loading reads no more than the
+manifest and processes using the same artifact share its pages in the OS page
+cache. Artifacts are located with importlib.resources, independent of the
+working directory.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+import numpy as np
+
+from lazydate.models.config import (
+    DIGITS,
+    MAX_SEQUENCE_LEN,
+    OUTPUT_SEQUENCE_LEN,
+    VOCABULARY,
+)
+
+# 2 added "architecture" and "config", version 1 artifacts are all "lstm"
+FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+DEFAULT_MODEL = "lstm_date_model_v06"
+# TFLite conversion needs an unmasked model, and the students were distilled
+# from this one
+UNMASKED_MODEL = "lstm_date_model_v05"
+
+
+def artifact_path(name: str = DEFAULT_MODEL) -> str:
+    """Directory of the packaged artifact `name`"""
+    try:
+        from importlib.resources import files
+    except ImportError:
+        # Python < 3.9
+        return os.path.join(os.path.dirname(__file__), "artifacts", name)
+    return str(files("lazydate.models") / "artifacts" / name)
+
+
+def save_artifact(fn: str, directory: str):
+    """Write an artifact from an .npz exported with DateModel.save_numpy_weights"""
+    with np.load(fn) as data:
+        arrays = {k: data[k] for k in data.files}
+    mask_padding = bool(arrays.pop("mask_padding", False))
+    max_sequence_len = int(arrays.pop("max_sequence_len", MAX_SEQUENCE_LEN))
+    architecture = str(arrays.pop("architecture", "lstm"))
+    dilation_rates = arrays.pop("dilation_rates", None)
+    config = {}
+    if architecture == "cnn" and dilation_rates is not None:
+        config["dilation_rates"] = [int(rate) for rate in dilation_rates]
+
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "name": os.path.basename(os.path.normpath(directory)),
+        "architecture": architecture,
+        "config": config,
+        "vocabulary": VOCABULARY,
+        "max_sequence_len": max_sequence_len,
+        "mask_padding": mask_padding,
+        "output_vocabulary": DIGITS,
+        "output_sequence_len": OUTPUT_SEQUENCE_LEN,
+        "arrays": sorted(arrays),
+    }
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest["format_version"] > FORMAT_VERSION:
+        raise ValueError(
+            f"Artifact {directory} has format version {manifest['format_version']}, "
+            f"this version of lazydate reads up to {FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def load_arrays(directory: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    :param mmap: memory-map the arrays read-only rather than reading them
+    """
+    manifest = read_manifest(directory)
+    return {
+        name: np.load(
+            os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None
+        )
+        for name in manifest["arrays"]
+    }
@@ -4,6 +4,9 @@ SYMBOLS = "£&()[]+-/*;:@_\\\"'#" + "€$%!?,. "
 VOCABULARY = LETTERS + DIGITS + SYMBOLS
 
 MAX_SEQUENCE_LEN = 200
+# %Y%m%d
+OUTPUT_SEQUENCE_LEN = 8
+LENGTH_BUCKETS = (16, 32, 64, 128, MAX_SEQUENCE_LEN)
 UNK_TOKEN = "<unk>"
 
 MODEL_INPUT_NAME = "datestr"
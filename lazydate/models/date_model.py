@@ -1,30 +1,87 @@
-from typing import List
+import os
+from typing import Any, Callable, List, Optional
 
 import numpy as np
+import tensorflow as tf
 from tensorflow.keras.callbacks import EarlyStopping
 
 from lazydate.models.config import (
     DIGITS,
+    LENGTH_BUCKETS,
     MODEL_INPUT_NAME,
     MODEL_OUTPUT_NAME,
     VOCABULARY,
 )
-from lazydate.models.generator import DataGenerator
-from lazydate.models.tf_model import lstm_encoder_decoder
+from lazydate.models.numpy_model import (
+    ARCHITECTURES,
+    DEFAULT_DILATION_RATES,
+    weight_names,
+)
+from lazydate.models.tf_model import BUILDERS, compile_model
+from lazydate.models.tf_utils import use_cpu
 from lazydate.models.vectorizer import CharVectorizer
 
 
 class DateModel:
-    def __init__(self):
-        self.input_vectorizer = CharVectorizer(vocabulary=VOCABULARY)
+    def __init__(
+        self,
+        mask_padding: bool = False,
+        compile: bool = True,
+        architecture: str = "lstm",
+        **model_kwargs,
+    ):
+        """
+        :param mask_padding: reserve a padding index and mask it in the encoder.
+            Masked models only run as many timesteps as the longest input in each
+            length bucket. The default lstm_date_model_v06 weights are masked.
+        :param compile: build the optimizer and metrics, which only fit needs
+        :param architecture: "lstm", or one of the smaller students to distil
+            from it, "gru" or "cnn" (see lazydate.models.tf_model)
+        :param model_kwargs: passed to the architecture's builder, e.g.
+            hidden_dim or filters
+        """
+        if architecture not in ARCHITECTURES:
+            raise ValueError(
+                f"Unknown architecture {architecture!r}, expected one of "
+                f"{ARCHITECTURES}"
+            )
+        if mask_padding and architecture != "lstm":
+            raise ValueError("mask_padding is only supported by the lstm architecture")
+        if architecture == "lstm":
+            model_kwargs["mask_padding"] = mask_padding
+        self.architecture = architecture
+        self.dilation_rates = tuple(
+            model_kwargs.get("dilation_rates", DEFAULT_DILATION_RATES)
+        )
+        self.mask_padding = mask_padding
+        self.input_vectorizer = CharVectorizer(
+            vocabulary=VOCABULARY, mask_padding=mask_padding
+        )
         self.output_vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
-        self.model = lstm_encoder_decoder(
-            input_sequence_len=self.input_vectorizer.max_sequence_len,
-            input_vocab_size=len(self.input_vectorizer.vocabulary),
+        self.model = BUILDERS[architecture](
+            input_sequence_len=None if mask_padding else self.input_sequence_len,
+            input_vocab_size=self.input_vectorizer.vocab_size,
             output_sequence_len=self.output_vectorizer.max_sequence_len,
-            output_vocab_size=len(self.output_vectorizer.vocabulary),
+            output_vocab_size=self.output_vectorizer.vocab_size,
+            compile=compile,
+            **model_kwargs,
+        )
+        # The batch dimension is left unspecified so a single concrete function
+        # serves every batch size without retracing, likewise the sequence
+        # dimension for masked models
+        input_shape = (None, None if mask_padding else self.input_sequence_len)
+        input_signature = [tf.TensorSpec(shape=input_shape, dtype=tf.int32)]
+        self._predict_fn = tf.function(
+            self._argmax_outputs, input_signature=input_signature
+        )
+        self._proba_fn = tf.function(
+            self._proba_outputs, input_signature=input_signature
         )
 
+    @property
+    def input_sequence_len(self) -> int:
+        return self.input_vectorizer.max_sequence_len
+
     def fit(
         self,
         training_examples: int = 200000,
@@ -34,9 +91,57 @@ class DateModel:
         max_queue_size: int = 20,
         workers: int = 2,
         use_multiprocessing: bool = False,
+        seed: Optional[int] = None,
+        corpus: Optional[str] = None,
+        validation_corpus: Optional[str] = None,
+        teacher: Optional[Any] = None,
+        temperature: float = 2.0,
+        alpha: float = 0.5,
     ):
-        gen_train = DataGenerator(n_examples=training_examples)
-        gen_val = DataGenerator(n_examples=validation_examples)
+        """
+        :param seed: makes the generated training data reproducible, also with
+            use_multiprocessing
+        :param corpus: directory written by lazydate.data_generation.corpus to
+            train on instead of generating examples every epoch
+            (training_examples is then ignored)
+        :param validation_corpus: as corpus, for the validation data
+        :param teacher: distil this model into this one. A NumpyDateModel or
+            DateModel with the same input vocabulary, or the path of its
+            artifact directory. Targets mix the labels with the teacher's
+            softened output distribution (see DistillationSequence).
+        :param temperature: softens the teacher's distribution, higher spreads
+            more probability onto the runner-up characters
+        :param alpha: weight of the labels in the targets, the teacher gets
+            1 - alpha
+        """
+        # Training-only dependencies (babel, nlpaug, nltk) load here rather than
+        # on the inference path
+        from lazydate.models.generator import DataGenerator
+
+        if corpus is not None:
+            gen_train = self._corpus_sequence(corpus, shuffle=True, seed=seed)
+        else:
+            gen_train = DataGenerator(
+                n_examples=training_examples, mask_padding=self.mask_padding, seed=seed
+            )
+        if validation_corpus is not None:
+            gen_val = self._corpus_sequence(validation_corpus, shuffle=False)
+        else:
+            gen_val = DataGenerator(
+                n_examples=validation_examples,
+                mask_padding=self.mask_padding,
+                seed=None if seed is None else seed + 1,
+            )
+
+        if teacher is not None:
+            from lazydate.models.generator import DistillationSequence
+
+            teacher = self._load_teacher(teacher)
+            gen_train = DistillationSequence(gen_train, teacher, temperature, alpha)
+            gen_val = DistillationSequence(gen_val, teacher, temperature, alpha)
+            compile_model(self.model, soft_targets=True)
+        elif self.model.optimizer is None:
+            compile_model(self.model)
 
         early_stopping = EarlyStopping(
             monitor="val_loss", patience=patience, restore_best_weights=True
@@ -53,20 +158,160 @@ class DateModel:
         )
         return history
 
+    def _load_teacher(self, teacher: Any):
+        if isinstance(teacher, str):
+            from lazydate.models.numpy_model import NumpyDateModel
+
+            path, teacher = teacher, NumpyDateModel()
+            teacher.load_weights(path)
+        vectorizer = teacher.input_vectorizer
+        if (
+            vectorizer.vocabulary != self.input_vectorizer.vocabulary
+            or vectorizer.max_sequence_len != self.input_sequence_len
+            or vectorizer.mask_padding != self.mask_padding
+        ):
+            raise ValueError("Teacher and student must encode inputs the same way")
+        return teacher
+
+    def _corpus_sequence(self, directory: str, **kwargs):
+        from lazydate.models.generator import CorpusSequence
+
+        sequence = CorpusSequence(directory, **kwargs)
+        if sequence.mask_padding != self.mask_padding:
+            raise ValueError(
+                f"Corpus {directory} was written with mask_padding="
+                f"{sequence.mask_padding}, model has mask_padding={self.mask_padding}"
+            )
+        return sequence
+
+    def _proba_outputs(self, inputs: tf.Tensor) -> tf.Tensor:
+        pred_dict = self.model({MODEL_INPUT_NAME: inputs}, training=False)
+        return pred_dict[MODEL_OUTPUT_NAME]
+
+    def _argmax_outputs(self, inputs: tf.Tensor) -> tf.Tensor:
+        proba = self._proba_outputs(inputs)
+        return tf.argmax(proba, axis=-1, output_type=tf.int32)
+
     def predict_on_batch(self, input_strings: List[str]) -> List[str]:
-        model_inputs = {
-            MODEL_INPUT_NAME: self.input_vectorizer.transform(input_strings)
-        }
-        pred_dict = self.model.predict(model_inputs)
-        output_arrays = np.argmax(pred_dict[MODEL_OUTPUT_NAME], axis=-1)
+        if len(input_strings) == 0:
+            return []
+        model_inputs = self.input_vectorizer.transform(input_strings)
+        lengths = self.input_vectorizer.lengths(input_strings)
+        return self.predict_encoded(model_inputs, lengths)
+
+    def predict_encoded(self, inputs: np.ndarray, lengths: np.ndarray) -> List[str]:
+        """
+        :param inputs: (n, max_sequence_len) output of input_vectorizer.transform
+        :param lengths: (n,) output of input_vectorizer.lengths
+        """
+        output_arrays = self.predict_indices(inputs, lengths)
         pred_strings = self.output_vectorizer.inverse_transform(output_arrays)
         return pred_strings
 
+    @use_cpu
+    def predict_indices(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """:return: (n, output_sequence_len) argmax output vocabulary indices"""
+        if len(inputs) == 0:
+            return np.zeros(
+                (0, self.output_vectorizer.max_sequence_len), dtype=np.int32
+            )
+        if self.mask_padding:
+            return self._predict_bucketed(inputs, lengths)
+        return self._predict_fn(inputs).numpy()
+
+    @use_cpu
+    def predict_proba(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """:return: (n, output_sequence_len, output_vocab_size) softmax outputs"""
+        if len(inputs) == 0:
+            return np.zeros(
+                (
+                    0,
+                    self.output_vectorizer.max_sequence_len,
+                    self.output_vectorizer.vocab_size,
+                ),
+                dtype=np.float32,
+            )
+        if self.mask_padding:
+            return self._predict_bucketed(inputs, lengths, fn=self._proba_fn)
+        return self._proba_fn(inputs).numpy()
+
+    def _predict_bucketed(
+        self,
+        inputs: np.ndarray,
+        lengths: np.ndarray,
+        fn: Optional[Callable[[np.ndarray], tf.Tensor]] = None,
+    ) -> np.ndarray:
+        """
+        Groups inputs into LENGTH_BUCKETS and runs each group truncated to its
+        bucket width. Only valid for masked models, where trailing padding
+        does not change the output.
+
+        :param fn: compiled prediction function, argmax indices by default
+        """
+        fn = fn or self._predict_fn
+        outputs = None
+        buckets = [b for b in LENGTH_BUCKETS if b < self.input_sequence_len]
+        buckets.append(self.input_sequence_len)
+        bucket_ids = np.searchsorted(buckets, lengths)
+        for bucket_id in np.unique(bucket_ids):
+            idx = np.flatnonzero(bucket_ids == bucket_id)
+            width = buckets[bucket_id]
+            predictions = fn(inputs[idx, :width]).numpy()
+            if outputs is None:
+                outputs = np.zeros(
+                    (len(inputs),) + predictions.shape[1:], dtype=predictions.dtype
+                )
+            outputs[idx] = predictions
+        assert outputs is not None
+        return outputs
+
     def predict(self, input_string: str) -> str:
         return self.predict_on_batch([input_string])[0]
 
     def save_weights(self, fn: str):
         self.model.save_weights(fn)
 
+    def _weight_layers(self):
+        return [layer for layer in self.model.layers if layer.weights]
+
+    def save_numpy_weights(self, fn: str):
+        """Export weights to an .npz file that NumpyDateModel can load"""
+        weights = [w for layer in self._weight_layers() for w in layer.get_weights()]
+        names = weight_names(self.architecture, len(self.dilation_rates))
+        np.savez(
+            fn,
+            **dict(zip(names, weights)),
+            architecture=np.array(self.architecture),
+            dilation_rates=np.array(self.dilation_rates),
+            mask_padding=np.array(self.mask_padding),
+            max_sequence_len=np.array(self.input_sequence_len),
+        )
+
     def load_weights(self, fn: str):
-        self.model.load_weights(fn)
+        """
+        :param fn: TensorFlow checkpoint, or artifact directory (see
+            lazydate.models.artifact)
+        """
+        if not os.path.isdir(fn):
+            self.model.load_weights(fn)
+            return
+
+        from lazydate.models.artifact import load_arrays, read_manifest
+
+        manifest = read_manifest(fn)
+        if manifest.get("architecture", "lstm") != self.architecture:
+            raise ValueError(
+                f"Artifact {fn} holds a {manifest.get('architecture', 'lstm')} "
+                f"model, model is {self.architecture}"
+            )
+        if manifest["mask_padding"] != self.mask_padding:
+            raise ValueError(
+                f"Artifact {fn} has mask_padding={manifest['mask_padding']}, "
+                f"model has mask_padding={self.mask_padding}"
+            )
+        if manifest["vocabulary"] != VOCABULARY:
+            raise ValueError(f"Artifact {fn} has a different input vocabulary")
+        weights = load_arrays(fn, mmap=False)
+        names = iter(weight_names(self.architecture, len(self.dilation_rates)))
+        for layer in self._weight_layers():
+            layer.set_weights([weights[next(names)] for _ in layer.get_weights()])
@@ -0,0 +1,157 @@
+"""
+Smaller students distilled from lstm_date_model_v05, and how they compare.
+
+distil trains a DateModel student with DateModel.fit(teacher=...) on examples
+from DataGenerator and writes it as an artifact:
+
+    python -m lazydate.models.distillation cnn cnn_date_model_v01 --epochs 10
+
+compare_models reports parameters, artifact bytes, CPU latency per string and
+sequence accuracy for any artifacts, see benchmarks/distillation.py.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from lazydate.models.artifact import UNMASKED_MODEL, artifact_path, read_manifest
+from lazydate.models.config import UNK_TOKEN
+from lazydate.models.quantization import _latency
+
+
+def distil(
+    architecture: str,
+    directory: str,
+    teacher: Optional[str] = None,
+    training_examples: int = 200000,
+    validation_examples: int = 10000,
+    epochs: int = 10,
+    seed: Optional[int] = None,
+    temperature: float = 2.0,
+    alpha: float = 0.5,
+    **model_kwargs,
+):
+    """
+    Train an `architecture` student (see DateModel) and save it as an artifact
+    in `directory`. Needs TensorFlow and the training dependencies.
+
+    :param teacher: artifact directory of the teacher, the packaged
+        lstm_date_model_v05 by default
+    :param model_kwargs: passed to the student's builder in tf_model
+    :return: the Keras training history
+    """
+    from lazydate.models.artifact import save_artifact
+    from lazydate.models.date_model import DateModel
+
+    student = DateModel(architecture=architecture, **model_kwargs)
+    history = student.fit(
+        training_examples=training_examples,
+        validation_examples=validation_examples,
+        epochs=epochs,
+        seed=seed,
+        teacher=teacher or artifact_path(UNMASKED_MODEL),
+        temperature=temperature,
+        alpha=alpha,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = os.path.join(tmp, "weights.npz")
+        student.save_numpy_weights(fn)
+        save_artifact(fn, directory)
+    return history
+
+
+def compare_models(
+    directories: Sequence[str],
+    n_examples: int = 2000,
+    seed: int = 0,
+    batch_sizes: Sequence[int] = (1, 1024),
+    repeats: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Size, latency and accuracy of the NumpyDateModel artifacts in `directories`
+    on a held-out set from lazydate.data_generation.generate_dates. Sequence
+    accuracy counts examples with all output characters right, as
+    tf_model.sequence_accuracy does. Agreement is with the first model's
+    predictions. Needs the training dependencies.
+    """
+    from lazydate.data_generation import generate_dates
+    from lazydate.models.artifact import load_arrays
+    from lazydate.models.numpy_model import NumpyDateModel
+
+    examples = generate_dates(n_examples, seed=seed)
+    texts = [datestr for datestr, _, _ in examples]
+
+    results: List[Dict[str, Any]] = []
+    reference = None
+    for directory in directories:
+        date_model = NumpyDateModel()
+        date_model.load_weights(directory)
+        output_len = date_model.output_vectorizer.max_sequence_len
+        targets = date_model.output_vectorizer.transform(
+            [
+                date.strftime("%Y%m%d") if date else UNK_TOKEN * output_len
+                for _, date, _ in examples
+            ]
+        )
+        inputs = date_model.input_vectorizer.transform(texts)
+        lengths = date_model.input_vectorizer.lengths(texts)
+        predictions = date_model.predict_indices(inputs, lengths)
+        if reference is None:
+            reference = predictions
+
+        manifest = read_manifest(directory)
+        arrays = load_arrays(directory)
+        results.append(
+            {
+                "name": manifest["name"],
+                "architecture": manifest.get("architecture", "lstm"),
+                "params": int(sum(array.size for array in arrays.values())),
+                "bytes": sum(
+                    os.path.getsize(os.path.join(directory, fn))
+                    for fn in os.listdir(directory)
+                ),
+                "latency_us_per_string": {
+                    str(batch_size): 1e6
+                    * _latency(date_model, texts, batch_size, repeats)
+                    for batch_size in batch_sizes
+                },
+                "sequence_accuracy": float(np.mean((predictions == targets).all(-1))),
+                "agreement": float(np.mean((predictions == reference).all(-1))),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("architecture", choices=["gru", "cnn"])
+    parser.add_argument("directory", help="where to write the student artifact")
+    parser.add_argument("--teacher", help="teacher artifact directory")
+    parser.add_argument("--training-examples", type=int, default=200000)
+    parser.add_argument("--validation-examples", type=int, default=10000)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5)
+    args = parser.parse_args()
+
+    history = distil(
+        args.architecture,
+        args.directory,
+        teacher=args.teacher,
+        training_examples=args.training_examples,
+        validation_examples=args.validation_examples,
+        epochs=args.epochs,
+        seed=args.seed,
+        temperature=args.temperature,
+        alpha=args.alpha,
+    )
+    print(json.dumps({k: [float(v) for v in vs] for k, vs in history.history.items()}))
+
+
+if __name__ == "__main__":
+    main()
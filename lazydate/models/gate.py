@@ -0,0 +1,67 @@
+"""
+No-date gate run on encoded inputs before the model.
+
+Every date the model is trained to read has a numeric year, so an input with no
+digit among its encoded characters has no date the model could decode. The
+parser answers those "" (None) straight away and only sends the rest to the
+model. The check is one table lookup over the encoded batch. Month names are
+not checked: without a digit they can't make a full date, so they would only
+let more date-free inputs through.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+from lazydate.models.config import DIGITS
+from lazydate.models.vectorizer import CharVectorizer
+
+
+def may_contain_date(inputs: np.ndarray, vectorizer: CharVectorizer) -> np.ndarray:
+    """
+    :param inputs: (n, max_sequence_len) output of vectorizer.transform
+    :return: (n,) True for inputs with at least one digit
+    """
+    is_digit = np.zeros(vectorizer.vocab_size, dtype=bool)
+    is_digit[[vectorizer.encoder[digit] for digit in DIGITS]] = True
+    # Padding is index 0, which is never a digit, so lengths aren't needed
+    return is_digit[inputs].any(axis=1)
+
+
+def gate_report(n_examples: int = 10000, seed: int = 0) -> Dict[str, Any]:
+    """
+    How the gate splits a held-out set from lazydate.data_generation.generate_dates,
+    about 10% of which have no date. The false-negative rate is the share of
+    inputs with a date that the gate turns away. changed_predictions counts
+    gated inputs for which the model would have returned a date. Needs the
+    training dependencies.
+    """
+    from lazydate.data_generation import generate_dates
+    from lazydate.models.artifact import artifact_path
+    from lazydate.models.numpy_model import NumpyDateModel
+
+    examples = generate_dates(n_examples, seed=seed)
+    texts = [datestr for datestr, _, _ in examples]
+    has_date = np.array([date is not None for _, date, _ in examples])
+
+    date_model = NumpyDateModel()
+    date_model.load_weights(artifact_path())
+    inputs = date_model.input_vectorizer.transform(texts)
+    lengths = date_model.input_vectorizer.lengths(texts)
+    gated = ~may_contain_date(inputs, date_model.input_vectorizer)
+    predictions = np.array(
+        date_model.predict_encoded(inputs[gated], lengths[gated]), dtype=object
+    )
+
+    n_dates = int(has_date.sum())
+    n_no_dates = n_examples - n_dates
+    return {
+        "n_examples": n_examples,
+        "n_dates": n_dates,
+        "n_no_dates": n_no_dates,
+        "gated": int(gated.sum()),
+        "false_negatives": int((gated & has_date).sum()),
+        "false_negative_rate": float((gated & has_date).sum() / max(n_dates, 1)),
+        "no_date_skip_rate": float((gated & ~has_date).sum() / max(n_no_dates, 1)),
+        "changed_predictions": int((predictions != "").sum()),
+    }
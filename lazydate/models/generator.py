@@ -1,18 +1,34 @@
 import math
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+import numpy as np
 from tensorflow.keras.utils import Sequence
 
-from lazydate.data_generation import generate_date
+from lazydate.data_generation import BatchRandom, generate_date
+from lazydate.data_generation.corpus import read_manifest, shard_paths
 from lazydate.models.config import VOCABULARY, DIGITS, UNK_TOKEN, MODEL_INPUT_NAME, MODEL_OUTPUT_NAME
 from lazydate.models.vectorizer import CharVectorizer
 
 
 class DataGenerator(Sequence):
-    def __init__(self, batch_size=32, n_examples=50000):
+    def __init__(
+        self,
+        batch_size=32,
+        n_examples=50000,
+        mask_padding=False,
+        seed: Optional[int] = None,
+    ):
+        """
+        :param seed: makes batch i of epoch e depend only on (seed, e, i), so
+            batches are reproducible whichever Keras worker process builds them
+        """
         self.batch_size = batch_size
         self.n_examples = n_examples
-        self.input_vectorizer = CharVectorizer(vocabulary=VOCABULARY)
+        self.seed = seed
+        self.epoch = 0
+        self.input_vectorizer = CharVectorizer(
+            vocabulary=VOCABULARY, mask_padding=mask_padding
+        )
         self.output_vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
 
     def __len__(self):
@@ -24,7 +40,7 @@ class DataGenerator(Sequence):
 
     @property
     def input_vocab_size(self):
-        return len(self.input_vectorizer.vocabulary)
+        return self.input_vectorizer.vocab_size
 
     @property
     def output_sequence_len(self):
@@ -32,14 +48,17 @@ class DataGenerator(Sequence):
 
     @property
     def output_vocab_size(self):
-        return len(self.output_vectorizer.vocabulary)
+        return self.output_vectorizer.vocab_size
 
-    def generate_string_batch(self) -> Tuple[List[str], List[str]]:
+    def generate_string_batch(
+        self, rng: Optional[BatchRandom] = None
+    ) -> Tuple[List[str], List[str]]:
         input_strings: List[str] = []
         output_strings: List[str] = []
 
+        rng = rng or BatchRandom()
         for _ in range(self.batch_size):
-            datestr, date, gen_dict = generate_date()
+            datestr, date, gen_dict = generate_date(rng=rng)
             if date:
                 output_datestr = date.strftime("%Y%m%d")
             else:
@@ -49,8 +68,113 @@ class DataGenerator(Sequence):
 
         return input_strings, output_strings
 
+    def on_epoch_end(self):
+        self.epoch += 1
+
     def __getitem__(self, idx: int):
-        input_strings, output_strings = self.generate_string_batch()
+        seed = None if self.seed is None else (self.seed, self.epoch, idx)
+        input_strings, output_strings = self.generate_string_batch(BatchRandom(seed))
         inputs = {MODEL_INPUT_NAME: self.input_vectorizer.transform(input_strings)}
         outputs = {MODEL_OUTPUT_NAME: self.output_vectorizer.transform(output_strings)}
         return inputs, outputs
+
+
+class CorpusSequence(Sequence):
+    """
+    Batches from a corpus written by lazydate.data_generation.corpus. Shards are
+    memory-mapped, so only the rows of each batch are read and copied, and
+    examples are shuffled across shards each epoch. Prefetching comes from
+    Keras (max_queue_size / workers in Model.fit).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        batch_size: int = 32,
+        shuffle: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.manifest = read_manifest(directory)
+        self.mask_padding = self.manifest["mask_padding"]
+
+        n_shards = len(self.manifest["shard_sizes"])
+        paths = [shard_paths(directory, shard) for shard in range(n_shards)]
+        self._inputs = [np.load(p["inputs"], mmap_mode="r") for p in paths]
+        self._outputs = [np.load(p["outputs"], mmap_mode="r") for p in paths]
+        # (shard, row) of every example, in training order
+        self._shards = np.repeat(np.arange(n_shards), self.manifest["shard_sizes"])
+        self._rows = np.concatenate(
+            [np.arange(size) for size in self.manifest["shard_sizes"]]
+        )
+        self._rng = np.random.RandomState(seed)
+        self._order = np.arange(len(self._rows))
+        if shuffle:
+            self._rng.shuffle(self._order)
+
+    def __len__(self):
+        return int(math.ceil(len(self._order) / self.batch_size))
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self._rng.shuffle(self._order)
+
+    def __getitem__(self, idx: int):
+        # Sorted, so each shard is read front to back
+        batch = np.sort(
+            self._order[idx * self.batch_size : (idx + 1) * self.batch_size]
+        )
+        shards, rows = self._shards[batch], self._rows[batch]
+        inputs = np.empty((len(batch), self._inputs[0].shape[1]), dtype=np.int32)
+        outputs = np.empty((len(batch), self._outputs[0].shape[1]), dtype=np.int32)
+        for shard in np.unique(shards):
+            mask = shards == shard
+            inputs[mask] = self._inputs[shard][rows[mask]]
+            outputs[mask] = self._outputs[shard][rows[mask]]
+        return {MODEL_INPUT_NAME: inputs}, {MODEL_OUTPUT_NAME: outputs}
+
+
+class DistillationSequence(Sequence):
+    """
+    Wraps a DataGenerator or CorpusSequence to train a student on a teacher's
+    outputs: targets are alpha * one-hot labels + (1 - alpha) * the teacher's
+    output distribution softened by `temperature`. Train with
+    tf_model.compile_model(model, soft_targets=True).
+    """
+
+    def __init__(
+        self,
+        sequence: Sequence,
+        teacher,
+        temperature: float = 2.0,
+        alpha: float = 0.5,
+    ):
+        """
+        :param teacher: model with predict_proba(inputs, lengths), e.g.
+            NumpyDateModel, encoding inputs as the student does
+        """
+        self.sequence = sequence
+        self.teacher = teacher
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def on_epoch_end(self):
+        self.sequence.on_epoch_end()
+
+    def __getitem__(self, idx: int):
+        inputs, outputs = self.sequence[idx]
+        encoded = inputs[MODEL_INPUT_NAME]
+        labels = outputs[MODEL_OUTPUT_NAME]
+        # Only masked teachers use the lengths, and with masking the padding
+        # index is 0
+        lengths = np.count_nonzero(encoded, axis=1)
+        proba = self.teacher.predict_proba(encoded, lengths)
+        soft = proba ** (1.0 / self.temperature)
+        soft /= soft.sum(axis=-1, keepdims=True)
+        one_hot = np.eye(soft.shape[-1], dtype=np.float32)[labels]
+        targets = self.alpha * one_hot + (1.0 - self.alpha) * soft
+        return inputs, {MODEL_OUTPUT_NAME: targets}
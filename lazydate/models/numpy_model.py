@@ -0,0 +1,352 @@
+import os
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from lazydate.models.config import DIGITS, MAX_SEQUENCE_LEN, VOCABULARY
+from lazydate.models.vectorizer import CharVectorizer
+
+# Names of the arrays written by DateModel.save_numpy_weights
+WEIGHT_NAMES = (
+    "embedding",
+    "encoder_fw_kernel",
+    "encoder_fw_recurrent_kernel",
+    "encoder_fw_bias",
+    "encoder_bw_kernel",
+    "encoder_bw_recurrent_kernel",
+    "encoder_bw_bias",
+    "decoder_kernel",
+    "decoder_recurrent_kernel",
+    "decoder_bias",
+    "dense_kernel",
+    "dense_bias",
+)
+ARCHITECTURES = ("lstm", "gru", "cnn")
+DEFAULT_DILATION_RATES = (1, 2, 4, 8)
+# Rows per convolution pass, each layer's activations take
+# rows * max_sequence_len * filters floats
+_CNN_ROWS = 256
+
+
+def weight_names(architecture: str = "lstm", conv_layers: int = 4) -> Tuple[str, ...]:
+    """
+    Names of the arrays exported for `architecture`, in the order of the Keras
+    model's weights. The GRU student has the same layers as the LSTM model.
+    """
+    if architecture not in ARCHITECTURES:
+        raise ValueError(
+            f"Unknown architecture {architecture!r}, expected one of {ARCHITECTURES}"
+        )
+    if architecture != "cnn":
+        return WEIGHT_NAMES
+    convs = tuple(
+        f"conv{i}_{part}" for i in range(conv_layers) for part in ("kernel", "bias")
+    )
+    return ("embedding",) + convs + WEIGHT_NAMES[7:]
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _lstm_step(z: np.ndarray, c: np.ndarray):
+    """Keras LSTM cell update from pre-activations z, gates ordered i, f, c, o"""
+    i, f, g, o = np.split(z, 4, axis=-1)
+    c = _sigmoid(f) * c + _sigmoid(i) * np.tanh(g)
+    h = _sigmoid(o) * np.tanh(c)
+    return h, c
+
+
+def _gru_step(x: np.ndarray, r: np.ndarray, h: np.ndarray) -> np.ndarray:
+    """
+    Keras GRU (reset_after=True) update from the input projection x and
+    recurrent projection r, both with their biases added, gates ordered z, r, h
+    """
+    x_z, x_r, x_h = np.split(x, 3, axis=-1)
+    r_z, r_r, r_h = np.split(r, 3, axis=-1)
+    z = _sigmoid(x_z + r_z)
+    candidate = np.tanh(x_h + _sigmoid(x_r + r_r) * r_h)
+    return z * h + (1.0 - z) * candidate
+
+
+def _conv_same(
+    inputs: np.ndarray, kernel: np.ndarray, bias: np.ndarray, dilation_rate: int
+) -> np.ndarray:
+    """Conv1D(padding="same", activation="relu") as a sum over the kernel taps"""
+    kernel_size = len(kernel)
+    seq_len = inputs.shape[1]
+    pad = dilation_rate * (kernel_size - 1)
+    padded = np.pad(inputs, ((0, 0), (pad // 2, pad - pad // 2), (0, 0)))
+    out = bias.astype(np.float32, copy=True)
+    for tap in range(kernel_size):
+        start = tap * dilation_rate
+        out = out + padded[:, start : start + seq_len] @ kernel[tap]
+    return np.maximum(out, 0.0)
+
+
+class NumpyDateModel:
+    """
+    TensorFlow-free implementation of the lstm_encoder_decoder forward pass
+    (Embedding -> BiLSTM -> RepeatVector -> LSTM -> TimeDistributed Dense)
+    running on weights exported with DateModel.save_numpy_weights. Also runs
+    the distilled gru_encoder_decoder and cnn_encoder_decoder students.
+    """
+
+    def __init__(self, batch_size: int = 1024):
+        """
+        :param batch_size: rows per forward pass, bounds peak memory
+        """
+        self.batch_size = batch_size
+        self.architecture = "lstm"
+        self.dilation_rates: Sequence[int] = DEFAULT_DILATION_RATES
+        self.mask_padding = False
+        self.input_vectorizer = CharVectorizer(vocabulary=VOCABULARY)
+        self.output_vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
+
+    def load_weights(self, fn: str, mmap: bool = True):
+        """
+        :param fn: artifact directory (see lazydate.models.artifact) or .npz
+            written by DateModel.save_numpy_weights
+        :param mmap: memory-map float32 artifact weights instead of reading them
+        """
+        if os.path.isdir(fn):
+            return self._load_artifact(fn, mmap)
+
+        with np.load(fn) as data:
+            weights = {k: data[k] for k in data.files}
+
+        self.mask_padding = bool(weights.get("mask_padding", False))
+        self.architecture = str(weights.get("architecture", "lstm"))
+        self.dilation_rates = tuple(
+            weights.get("dilation_rates", DEFAULT_DILATION_RATES)
+        )
+        self.input_vectorizer = CharVectorizer(
+            vocabulary=VOCABULARY,
+            max_sequence_len=int(weights.get("max_sequence_len", MAX_SEQUENCE_LEN)),
+            mask_padding=self.mask_padding,
+        )
+        names = weight_names(self.architecture, len(self.dilation_rates))
+        self.set_weights({name: weights[name] for name in names})
+
+    def _load_artifact(self, directory: str, mmap: bool):
+        from lazydate.models.artifact import load_arrays, read_manifest
+
+        manifest = read_manifest(directory)
+        self.mask_padding = manifest["mask_padding"]
+        # Format version 1 artifacts predate the students
+        self.architecture = manifest.get("architecture", "lstm")
+        self.dilation_rates = tuple(
+            manifest.get("config", {}).get("dilation_rates", DEFAULT_DILATION_RATES)
+        )
+        self.input_vectorizer = CharVectorizer(
+            vocabulary=manifest["vocabulary"],
+            max_sequence_len=manifest["max_sequence_len"],
+            mask_padding=self.mask_padding,
+        )
+        self.output_vectorizer = CharVectorizer(
+            vocabulary=manifest["output_vocabulary"],
+            max_sequence_len=manifest["output_sequence_len"],
+        )
+        self.set_weights(load_arrays(directory, mmap=mmap))
+
+    def set_weights(self, weights: Dict[str, np.ndarray]):
+        w = {k: np.asarray(v, dtype=np.float32) for k, v in weights.items()}
+        embedding = w["embedding"]
+
+        if self.architecture == "cnn":
+            # Fold the embedding into the first convolution, so its taps are
+            # row lookups. The extra zero row stands for "same" padding.
+            kernel = w["conv0_kernel"]
+            self._conv_inputs = np.stack(
+                [
+                    np.concatenate([embedding @ tap, np.zeros_like(tap[:1])])
+                    for tap in kernel
+                ]
+            )
+            self._conv_layers = [
+                (w[f"conv{i}_kernel"], w[f"conv{i}_bias"])
+                for i in range(len(self.dilation_rates))
+            ]
+        else:
+            # Fold the embedding into each direction's input projection so a
+            # timestep is a row lookup. Rows [0, vocab) are forward, [vocab,
+            # 2 * vocab) backward.
+            input_bias = {
+                d: (
+                    w[f"encoder_{d}_bias"][0]
+                    if self.architecture == "gru"
+                    else w[f"encoder_{d}_bias"]
+                )
+                for d in ("fw", "bw")
+            }
+            self._encoder_inputs = np.concatenate(
+                [
+                    embedding @ w["encoder_fw_kernel"] + input_bias["fw"],
+                    embedding @ w["encoder_bw_kernel"] + input_bias["bw"],
+                ]
+            )
+            self._encoder_recurrent = np.stack(
+                [w["encoder_fw_recurrent_kernel"], w["encoder_bw_recurrent_kernel"]]
+            )
+            if self.architecture == "gru":
+                # GRU biases are (2, 3 * hidden_dim): input then recurrent
+                self._encoder_recurrent_bias = np.stack(
+                    [w["encoder_fw_bias"][1:], w["encoder_bw_bias"][1:]]
+                )
+        self._decoder_kernel = w["decoder_kernel"]
+        self._decoder_recurrent = w["decoder_recurrent_kernel"]
+        self._decoder_bias = w["decoder_bias"]
+        self._dense_kernel = w["dense_kernel"]
+        self._dense_bias = w["dense_bias"]
+
+    @property
+    def hidden_dim(self) -> int:
+        return self._decoder_recurrent.shape[0]
+
+    def _encode(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        if self.architecture == "cnn":
+            return np.concatenate(
+                [
+                    self._encode_cnn(inputs[start : start + _CNN_ROWS])
+                    for start in range(0, len(inputs), _CNN_ROWS)
+                ]
+            )
+
+        n, seq_len = inputs.shape
+        vocab_size = len(self._encoder_inputs) // 2
+        encoder_dim = self._encoder_recurrent.shape[1]
+        # (seq_len, 2, n) row indices into self._encoder_inputs per timestep
+        rows = np.stack([inputs.T, inputs[:, ::-1].T + vocab_size], axis=1)
+
+        h = np.zeros((2, n, encoder_dim), dtype=np.float32)
+        if self.architecture == "gru":
+            for t in range(seq_len):
+                r = np.matmul(h, self._encoder_recurrent) + self._encoder_recurrent_bias
+                h = _gru_step(self._encoder_inputs[rows[t]], r, h)
+            return np.concatenate([h[0], h[1]], axis=-1)
+
+        c = np.zeros_like(h)
+        for t in range(seq_len):
+            z = self._encoder_inputs[rows[t]] + np.matmul(h, self._encoder_recurrent)
+            h_next, c_next = _lstm_step(z, c)
+            if self.mask_padding:
+                # Masked steps carry the previous state through
+                valid = np.stack([t < lengths, seq_len - 1 - t < lengths])[..., None]
+                h_next = np.where(valid, h_next, h)
+                c_next = np.where(valid, c_next, c)
+            h, c = h_next, c_next
+        return np.concatenate([h[0], h[1]], axis=-1)
+
+    def _encode_cnn(self, inputs: np.ndarray) -> np.ndarray:
+        n, seq_len = inputs.shape
+        padding_row = len(self._conv_inputs[0]) - 1
+        kernel_size = len(self._conv_inputs)
+        dilation_rate = self.dilation_rates[0]
+        pad = dilation_rate * (kernel_size - 1)
+        padded = np.pad(
+            inputs,
+            ((0, 0), (pad // 2, pad - pad // 2)),
+            constant_values=padding_row,
+        )
+        features = self._conv_layers[0][1].astype(np.float32, copy=True)
+        for tap in range(kernel_size):
+            start = tap * dilation_rate
+            features = (
+                features + self._conv_inputs[tap][padded[:, start : start + seq_len]]
+            )
+        features = np.maximum(features, 0.0)
+
+        for (kernel, bias), dilation_rate in zip(
+            self._conv_layers[1:], self.dilation_rates[1:]
+        ):
+            features = _conv_same(features, kernel, bias, dilation_rate)
+        # GlobalMaxPooling1D
+        return features.max(axis=1)
+
+    def _decode(self, encoding: np.ndarray) -> np.ndarray:
+        n = len(encoding)
+        h = np.zeros((n, self.hidden_dim), dtype=np.float32)
+        hs = []
+        if self.architecture == "lstm":
+            z_inputs = encoding @ self._decoder_kernel + self._decoder_bias
+            c = np.zeros_like(h)
+            for _ in range(self.output_vectorizer.max_sequence_len):
+                h, c = _lstm_step(z_inputs + h @ self._decoder_recurrent, c)
+                hs.append(h)
+        else:
+            x = encoding @ self._decoder_kernel + self._decoder_bias[0]
+            for _ in range(self.output_vectorizer.max_sequence_len):
+                r = h @ self._decoder_recurrent + self._decoder_bias[1]
+                h = _gru_step(x, r, h)
+                hs.append(h)
+        return np.stack(hs, axis=1) @ self._dense_kernel + self._dense_bias
+
+    def predict_logits(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        :param inputs: (n, max_sequence_len) encoded inputs
+        :param lengths: (n,) unpadded lengths, only used by masked models
+        :return: (n, output_sequence_len, output_vocab_size) pre-softmax scores
+        """
+        if self.mask_padding and len(inputs):
+            # With masking trailing padding has no effect, so skip it
+            inputs = inputs[:, : max(int(lengths.max()), 1)]
+        return self._decode(self._encode(inputs, lengths))
+
+    def predict_on_batch(self, input_strings: List[str]) -> List[str]:
+        if len(input_strings) == 0:
+            return []
+        inputs = self.input_vectorizer.transform(input_strings)
+        lengths = self.input_vectorizer.lengths(input_strings)
+        return self.predict_encoded(inputs, lengths)
+
+    def predict_encoded(self, inputs: np.ndarray, lengths: np.ndarray) -> List[str]:
+        """
+        :param inputs: (n, max_sequence_len) output of input_vectorizer.transform
+        :param lengths: (n,) output of input_vectorizer.lengths
+        """
+        output_arrays = self.predict_indices(inputs, lengths)
+        return self.output_vectorizer.inverse_transform(output_arrays)
+
+    def predict_indices(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """:return: (n, output_sequence_len) argmax output vocabulary indices"""
+        out = np.zeros(
+            (len(inputs), self.output_vectorizer.max_sequence_len), dtype=np.int32
+        )
+        return self._predict_sorted(
+            inputs, lengths, lambda logits: np.argmax(logits, axis=-1), out
+        )
+
+    def predict_proba(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """:return: (n, output_sequence_len, output_vocab_size) softmax outputs"""
+        out = np.zeros(
+            (
+                len(inputs),
+                self.output_vectorizer.max_sequence_len,
+                self.output_vectorizer.vocab_size,
+            ),
+            dtype=np.float32,
+        )
+        return self._predict_sorted(inputs, lengths, _softmax, out)
+
+    def _predict_sorted(
+        self,
+        inputs: np.ndarray,
+        lengths: np.ndarray,
+        transform: Callable[[np.ndarray], np.ndarray],
+        out: np.ndarray,
+    ) -> np.ndarray:
+        # Sorting by length lets masked models run each batch only as long as
+        # its longest input
+        order = np.argsort(lengths, kind="stable")
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start : start + self.batch_size]
+            out[idx] = transform(self.predict_logits(inputs[idx], lengths[idx]))
+        return out
+
+    def predict(self, input_string: str) -> str:
+        return self.predict_on_batch([input_string])[0]
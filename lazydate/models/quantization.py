@@ -0,0 +1,155 @@
+"""
+int8 inference for the LSTM model with TensorFlow Lite, and how it compares
+with float32.
+
+save_int8_model converts a float32 artifact once, with dynamic-range
+quantization: weight matrices are stored as int8 with float scales, and the
+fused LSTM and dense ops multiply them with activations quantized on the fly.
+TFLiteDateModel runs the result. Needs TensorFlow.
+
+    python -m lazydate.models.quantization lstm_date_model_v05_int8.tflite
+
+compare_precision reports size, latency and accuracy against the float32 NumPy
+backend, see benchmarks/precision.py.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from lazydate.models.artifact import UNMASKED_MODEL, artifact_path, read_manifest
+from lazydate.models.config import UNK_TOKEN
+
+
+def save_int8_model(fn: str, source: Optional[str] = None):
+    """
+    Write an int8 TensorFlow Lite model of the float32 artifact `source` (the
+    packaged lstm_date_model_v05 by default) to `fn`
+    """
+    import tensorflow as tf
+
+    from lazydate.models.date_model import DateModel
+
+    source = source or artifact_path(UNMASKED_MODEL)
+    if read_manifest(source)["mask_padding"]:
+        raise ValueError(f"Artifact {source} is masked, only unmasked models convert")
+    date_model = DateModel(compile=False)
+    date_model.load_weights(source)
+
+    # With a fixed input shape the converter fuses the LSTMs into TFLite ops,
+    # otherwise the recurrence stays a TensorFlow while loop it can't convert
+    predict = tf.function(lambda inputs: date_model.model(inputs, training=False))
+    concrete = predict.get_concrete_function(
+        tf.TensorSpec([1, date_model.input_sequence_len], tf.float32)
+    )
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [concrete], date_model.model
+    )
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    with open(fn, "wb") as f:
+        f.write(converter.convert())
+
+
+def _latency(date_model, texts: List[str], batch_size: int, repeats: int) -> float:
+    """Best-of-`repeats` seconds per string, vectorizing included"""
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    date_model.predict_on_batch(batch)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        date_model.predict_on_batch(batch)
+        best = min(best, time.perf_counter() - start)
+    return best / batch_size
+
+
+def _size(path: str) -> int:
+    """Bytes in a file, or in the files of an artifact directory"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, fn)) for fn in os.listdir(path))
+
+
+def compare_precision(
+    reference: Optional[str] = None,
+    int8_fn: Optional[str] = None,
+    n_examples: int = 2000,
+    seed: int = 0,
+    batch_sizes: Sequence[int] = (1, 64),
+    repeats: int = 3,
+) -> Dict[str, Any]:
+    """
+    Size, CPU latency per string and sequence accuracy of the float32 artifact
+    `reference` (the packaged lstm_date_model_v05 by default) and the int8
+    model `int8_fn` on a held-out set from
+    lazydate.data_generation.generate_dates. Sequence accuracy counts examples
+    with all output characters right. Needs the training dependencies.
+
+    :param int8_fn: .tflite file from save_int8_model, converted from
+        `reference` if not given
+    """
+    from lazydate.data_generation import generate_dates
+    from lazydate.models.numpy_model import NumpyDateModel
+    from lazydate.models.tflite_model import TFLiteDateModel
+
+    reference = reference or artifact_path(UNMASKED_MODEL)
+    examples = generate_dates(n_examples, seed=seed)
+    texts = [datestr for datestr, _, _ in examples]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if int8_fn is None:
+            int8_fn = os.path.join(tmp, "int8.tflite")
+            save_int8_model(int8_fn, reference)
+        models: Dict[str, Any] = {
+            "float32": NumpyDateModel(),
+            "int8": TFLiteDateModel(),
+        }
+        models["float32"].load_weights(reference)
+        models["int8"].load_weights(int8_fn)
+
+        results: Dict[str, Any] = {"n_examples": n_examples}
+        predictions = {}
+        for (name, date_model), path in zip(models.items(), [reference, int8_fn]):
+            output_len = date_model.output_vectorizer.max_sequence_len
+            targets = date_model.output_vectorizer.transform(
+                [
+                    date.strftime("%Y%m%d") if date else UNK_TOKEN * output_len
+                    for _, date, _ in examples
+                ]
+            )
+            inputs = date_model.input_vectorizer.transform(texts)
+            lengths = date_model.input_vectorizer.lengths(texts)
+            predictions[name] = date_model.predict_indices(inputs, lengths)
+            results[name] = {
+                "bytes": _size(path),
+                "latency_us_per_string": {
+                    str(batch_size): 1e6
+                    * _latency(date_model, texts, batch_size, repeats)
+                    for batch_size in batch_sizes
+                },
+                "sequence_accuracy": float(
+                    np.mean((predictions[name] == targets).all(-1))
+                ),
+            }
+    results["accuracy_delta"] = (
+        results["int8"]["sequence_accuracy"] - results["float32"]["sequence_accuracy"]
+    )
+    results["agreement"] = float(
+        np.mean((predictions["int8"] == predictions["float32"]).all(-1))
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fn", help="where to write the .tflite model")
+    parser.add_argument("--source", help="float32 artifact directory")
+    args = parser.parse_args()
+    save_int8_model(args.fn, args.source)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
+from typing import Callable, Dict, Optional, Tuple
+
 from tensorflow.keras import backend as K
 from tensorflow.keras.layers import (
+    GRU,
     LSTM,
     Bidirectional,
+    Conv1D,
     Dense,
     Embedding,
+    GlobalMaxPooling1D,
     Input,
     RepeatVector,
     TimeDistributed,
@@ -23,18 +28,28 @@ def sequence_accuracy(y_true, y_pred):
     return 1.0 - K.mean(errors)
 
 
+def soft_sequence_accuracy(y_true, y_pred):
+    """sequence_accuracy against the argmax of distillation targets"""
+    return sequence_accuracy(K.cast(K.argmax(y_true, axis=-1), "float32"), y_pred)
+
+
 def lstm_encoder_decoder(
-    input_sequence_len: int,
+    input_sequence_len: Optional[int],
     input_vocab_size: int,
     output_sequence_len: int,
     output_vocab_size: int,
     embedding_dim: int = 64,
     lstm_hidden_dim: int = 64,
     learning_rate: float = 1e-3,
+    mask_padding: bool = False,
+    compile: bool = True,
 ):
+    """
+    :param compile: attach the optimizer, loss and metrics, only needed to train
+    """
     _input = Input(shape=(input_sequence_len,), name=MODEL_INPUT_NAME)
     embedding = Embedding(
-        output_dim=embedding_dim, input_dim=input_vocab_size, mask_zero=False
+        output_dim=embedding_dim, input_dim=input_vocab_size, mask_zero=mask_padding
     )(_input)
     encoding = Bidirectional(LSTM(lstm_hidden_dim, return_sequences=False))(embedding)
     repeat_encoding = RepeatVector(output_sequence_len)(encoding)
@@ -43,10 +58,99 @@ def lstm_encoder_decoder(
     _output = TimeDistributed(Dense(output_vocab_size, activation="softmax"))(decoding)
 
     model = Model(inputs=[_input], outputs={MODEL_OUTPUT_NAME: _output})
+    if compile:
+        compile_model(model, learning_rate)
+    return model
+
+
+def compile_model(
+    model: Model, learning_rate: float = 1e-3, soft_targets: bool = False
+):
+    """
+    :param soft_targets: train on output distributions, as in distillation,
+        rather than on output vocabulary indices
+    """
     optimizer = Adam(lr=learning_rate)
+    if soft_targets:
+        model.compile(
+            optimizer,
+            loss="categorical_crossentropy",
+            metrics=["categorical_accuracy", soft_sequence_accuracy],
+        )
+        return
     model.compile(
         optimizer,
         loss="sparse_categorical_crossentropy",
         metrics=["accuracy", sequence_accuracy],
     )
+
+
+def gru_encoder_decoder(
+    input_sequence_len: Optional[int],
+    input_vocab_size: int,
+    output_sequence_len: int,
+    output_vocab_size: int,
+    embedding_dim: int = 32,
+    hidden_dim: int = 32,
+    learning_rate: float = 1e-3,
+    compile: bool = True,
+):
+    """lstm_encoder_decoder with smaller GRUs in place of the LSTMs"""
+    _input = Input(shape=(input_sequence_len,), name=MODEL_INPUT_NAME)
+    embedding = Embedding(output_dim=embedding_dim, input_dim=input_vocab_size)(_input)
+    encoding = Bidirectional(GRU(hidden_dim, return_sequences=False))(embedding)
+    repeat_encoding = RepeatVector(output_sequence_len)(encoding)
+
+    decoding = GRU(hidden_dim, return_sequences=True)(repeat_encoding)
+    _output = TimeDistributed(Dense(output_vocab_size, activation="softmax"))(decoding)
+
+    model = Model(inputs=[_input], outputs={MODEL_OUTPUT_NAME: _output})
+    if compile:
+        compile_model(model, learning_rate)
+    return model
+
+
+def cnn_encoder_decoder(
+    input_sequence_len: Optional[int],
+    input_vocab_size: int,
+    output_sequence_len: int,
+    output_vocab_size: int,
+    embedding_dim: int = 32,
+    filters: int = 64,
+    kernel_size: int = 3,
+    dilation_rates: Tuple[int, ...] = (1, 2, 4, 8),
+    hidden_dim: int = 64,
+    learning_rate: float = 1e-3,
+    compile: bool = True,
+):
+    """
+    Dilated 1D convolutions max-pooled over time as the encoder, so encoding
+    has no sequential dependency across the 200 input steps, and a GRU decoder
+    """
+    _input = Input(shape=(input_sequence_len,), name=MODEL_INPUT_NAME)
+    features = Embedding(output_dim=embedding_dim, input_dim=input_vocab_size)(_input)
+    for dilation_rate in dilation_rates:
+        features = Conv1D(
+            filters,
+            kernel_size,
+            dilation_rate=dilation_rate,
+            padding="same",
+            activation="relu",
+        )(features)
+    encoding = GlobalMaxPooling1D()(features)
+    repeat_encoding = RepeatVector(output_sequence_len)(encoding)
+
+    decoding = GRU(hidden_dim, return_sequences=True)(repeat_encoding)
+    _output = TimeDistributed(Dense(output_vocab_size, activation="softmax"))(decoding)
+
+    model = Model(inputs=[_input], outputs={MODEL_OUTPUT_NAME: _output})
+    if compile:
+        compile_model(model, learning_rate)
     return model
+
+
+BUILDERS: Dict[str, Callable[..., Model]] = {
+    "lstm": lstm_encoder_decoder,
+    "gru": gru_encoder_decoder,
+    "cnn": cnn_encoder_decoder,
+}
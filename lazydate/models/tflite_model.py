@@ -0,0 +1,117 @@
+import threading
+from typing import Any, List
+
+import numpy as np
+
+from lazydate.models.config import DIGITS, VOCABULARY
+from lazydate.models.vectorizer import CharVectorizer
+
+
+def _interpreter_class() -> Any:
+    """The TensorFlow Lite interpreter from whichever runtime is installed"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter, OpResolverType
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter, OpResolverType
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+            OpResolverType = tf.lite.experimental.OpResolverType
+    return Interpreter, OpResolverType
+
+
+class TFLiteDateModel:
+    """
+    lstm_encoder_decoder converted to TensorFlow Lite with int8 weights by
+    lazydate.models.quantization. The LSTMs run as fused TFLite ops whose
+    matmuls take the int8 weights against inputs quantized on the fly
+    (dynamic-range quantization).
+
+    The converter only fuses the LSTMs for a fixed batch size, so the model
+    takes one input per invoke. Interpreters aren't thread safe, so each thread
+    gets its own. Runs on ai_edge_litert or tflite_runtime if either is
+    installed, as they import much faster and lighter than TensorFlow.
+    """
+
+    def __init__(self):
+        self.mask_padding = False
+        self.input_vectorizer = CharVectorizer(vocabulary=VOCABULARY)
+        self.output_vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
+        self._model_path = ""
+        self._local = threading.local()
+
+    def load_weights(self, fn: str):
+        """:param fn: .tflite file written by quantization.save_int8_model"""
+        self._model_path = fn
+        self._local = threading.local()
+        input_shape = self._interpreter().get_input_details()[0]["shape"]
+        self.input_vectorizer = CharVectorizer(
+            vocabulary=VOCABULARY, max_sequence_len=int(input_shape[1])
+        )
+
+    def _interpreter(self) -> Any:
+        interpreter = getattr(self._local, "interpreter", None)
+        if interpreter is None:
+            Interpreter, OpResolverType = _interpreter_class()
+            # The default XNNPACK delegate repacks the weights into about 12 MB
+            # of private memory per process, for about 20% more speed
+            interpreter = Interpreter(
+                model_path=self._model_path,
+                num_threads=1,
+                experimental_op_resolver_type=(
+                    OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+                ),
+            )
+            interpreter.allocate_tensors()
+            self._local.interpreter = interpreter
+        return interpreter
+
+    def predict_proba(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        :param inputs: (n, max_sequence_len) output of input_vectorizer.transform
+        :param lengths: unused, the model is unmasked
+        :return: (n, output_sequence_len, output_vocab_size) softmax outputs
+        """
+        interpreter = self._interpreter()
+        input_index = interpreter.get_input_details()[0]["index"]
+        output_index = interpreter.get_output_details()[0]["index"]
+        out = np.zeros(
+            (
+                len(inputs),
+                self.output_vectorizer.max_sequence_len,
+                self.output_vectorizer.vocab_size,
+            ),
+            dtype=np.float32,
+        )
+        rows = inputs.astype(np.float32)
+        for idx in range(len(rows)):
+            # The fused LSTMs keep their state in variables between invokes
+            interpreter.reset_all_variables()
+            interpreter.set_tensor(input_index, rows[idx : idx + 1])
+            interpreter.invoke()
+            out[idx] = interpreter.get_tensor(output_index)[0]
+        return out
+
+    def predict_indices(self, inputs: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """:return: (n, output_sequence_len) argmax output vocabulary indices"""
+        return np.argmax(self.predict_proba(inputs, lengths), axis=-1).astype(np.int32)
+
+    def predict_encoded(self, inputs: np.ndarray, lengths: np.ndarray) -> List[str]:
+        """
+        :param inputs: (n, max_sequence_len) output of input_vectorizer.transform
+        :param lengths: (n,) output of input_vectorizer.lengths
+        """
+        output_arrays = self.predict_indices(inputs, lengths)
+        return self.output_vectorizer.inverse_transform(output_arrays)
+
+    def predict_on_batch(self, input_strings: List[str]) -> List[str]:
+        if len(input_strings) == 0:
+            return []
+        inputs = self.input_vectorizer.transform(input_strings)
+        lengths = self.input_vectorizer.lengths(input_strings)
+        return self.predict_encoded(inputs, lengths)
+
+    def predict(self, input_string: str) -> str:
+        return self.predict_on_batch([input_string])[0]
@@ -1,17 +1,43 @@
-from typing import List, Dict
+from typing import Dict, List, Optional
 
 import numpy as np
 
-from lazydate.models.config import UNK_TOKEN, MAX_SEQUENCE_LEN
+from lazydate.models.config import MAX_SEQUENCE_LEN, UNK_TOKEN
 
 
 class CharVectorizer:
-    def __init__(self, vocabulary: str, max_sequence_len: int = MAX_SEQUENCE_LEN):
+    def __init__(
+        self,
+        vocabulary: str,
+        max_sequence_len: int = MAX_SEQUENCE_LEN,
+        mask_padding: bool = False,
+    ):
+        """
+        :param mask_padding: reserve index 0 for padding so it can be masked.
+            By default padding shares index 0 with the first vocabulary character.
+        """
         self.max_sequence_len = max_sequence_len
+        self.mask_padding = mask_padding
+        offset = int(mask_padding)
         self.encoder: Dict[str, int] = {
-            c: idx for idx, c in enumerate(list(vocabulary))
+            c: idx + offset for idx, c in enumerate(list(vocabulary))
         }
-        self.encoder[UNK_TOKEN] = len(self.encoder)
+        self.encoder[UNK_TOKEN] = len(self.encoder) + offset
+        self.unk_index = self.encoder[UNK_TOKEN]
+
+        # Dense codepoint -> index table. The final slot catches every codepoint
+        # outside the table so lookups never need a bounds check.
+        max_codepoint = max(ord(c) for c in vocabulary)
+        self._codepoint_table = np.full(max_codepoint + 2, self.unk_index, np.int32)
+        for c, idx in self.encoder.items():
+            if c != UNK_TOKEN:
+                self._codepoint_table[ord(c)] = idx
+
+        # Index -> character table, UNK and padding decode to the empty string
+        self._char_table = np.full(self.vocab_size, "", dtype="U1")
+        for c, idx in self.encoder.items():
+            if c != UNK_TOKEN:
+                self._char_table[idx] = c
 
     @property
     def decoder(self):
@@ -21,35 +47,65 @@ class CharVectorizer:
     def vocabulary(self):
         return sorted(list(self.encoder.keys()))
 
-    def transform(self, inputs: List[str]) -> np.ndarray:
-        outputs = [self._get_char_indices_for_word(s) for s in inputs]
-        outputs = np.array(outputs)
-        return outputs
+    @property
+    def vocab_size(self) -> int:
+        """Number of distinct indices, including a reserved padding index"""
+        return self.unk_index + 1
+
+    def transform(
+        self, inputs: List[str], out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        :param inputs: strings to encode, truncated to self.max_sequence_len
+        :param out: optional int32 buffer of shape (>= len(inputs), max_sequence_len)
+            to write into, e.g. to reuse memory across batches
+        :return: (len(inputs), self.max_sequence_len) int32 array
+        """
+        n = len(inputs)
+        if out is None:
+            out = np.zeros((n, self.max_sequence_len), dtype=np.int32)
+        else:
+            out = out[:n]
+            out.fill(0)
+        if n == 0:
+            return out
+
+        truncated = [s[: self.max_sequence_len] for s in inputs]
+        chars = np.array(truncated, dtype=str)
+        width = chars.dtype.itemsize // 4
+        if width == 0:
+            return out
+
+        codepoints = chars.view(np.uint32).reshape(n, width)
+        indices = self._codepoint_table[
+            np.minimum(codepoints, len(self._codepoint_table) - 1)
+        ]
+
+        # Numpy pads short strings with NUL codepoints, so mask on the real lengths
+        # rather than on the codepoint value. Padding is encoded as index 0.
+        lengths = self.lengths(truncated)
+        in_string = np.arange(width) < lengths[:, None]
+        out[:, :width] = np.where(in_string, indices, 0)
+        return out
+
+    def lengths(self, inputs: List[str]) -> np.ndarray:
+        """Number of encoded (non-padding) positions for each input"""
+        return np.fromiter(
+            (min(len(s), self.max_sequence_len) for s in inputs),
+            dtype=np.int32,
+            count=len(inputs),
+        )
 
     def inverse_transform(self, arr: np.ndarray) -> List[str]:
         """
         :param arr: (n_examples, self.max_sequence_length)
-        :return: List[str]
+        :return: List[str], empty string for any row containing UNK
         """
-        output_strings: List[str] = []
-
-        for output in arr:
-            decoded_output = [self.decoder[o] for o in output]
-            if "<unk>" in decoded_output:
-                output_strings.append("")
-            else:
-                output_strings.append("".join(decoded_output))
-
-        return output_strings
-
-    def _get_char_indices_for_word(self, text: str) -> np.ndarray:
-        next_arr = np.zeros([self.max_sequence_len], dtype=np.int32)
-
-        for idx, token in enumerate(text):
-            if idx < self.max_sequence_len:  # truncate end of sentence if too long
-                if token in self.encoder:
-                    vocab_idx = self.encoder[token]
-                else:
-                    vocab_idx = self.encoder[UNK_TOKEN]
-                next_arr[idx] = vocab_idx
-        return next_arr
+        arr = np.asarray(arr)
+        if len(arr) == 0:
+            return []
+
+        chars = np.ascontiguousarray(self._char_table[arr])
+        strings = chars.view(f"U{arr.shape[1]}").ravel()
+        strings[(arr == self.unk_index).any(axis=1)] = ""
+        return strings.tolist()
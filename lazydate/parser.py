@@ -1,51 +1,800 @@
+import collections
+import gc
+import itertools
 import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
-from lazydate.models import DateModel
+from lazydate import metrics
+from lazydate.batcher import MicroBatcher
+from lazydate.cache import MISSING, CacheInfo, LRUCache
+from lazydate.exact import parse_exact
 from lazydate.models.config import MAX_SEQUENCE_LEN
-from lazydate.models.tf_utils import use_cpu
+
+if TYPE_CHECKING:
+    import asyncio
 
 logger = logging.getLogger(__name__)
-_date_model = None
+BACKENDS = (
+    "numpy",
+    "tensorflow",
+    "numpy-cnn",
+    "numpy-gru",
+)
+# The distilled students can disagree with the LSTM, so their results are
+# cached under separate keys
+_CACHE_NAMESPACES = {
+    "numpy-cnn": "cnn",
+    "numpy-gru": "gru",
+}
+# Packaged artifacts of the distilled students, see lazydate.models.distillation
+_STUDENT_MODELS = {
+    "numpy-cnn": "cnn_date_model_v01",
+    "numpy-gru": "gru_date_model_v01",
+}
+# Backends whose models are plain arrays, which forked children can keep using
+_FORK_SAFE_BACKENDS = (
+    "numpy",
+    "numpy-cnn",
+    "numpy-gru",
+)
+_date_models: Dict[str, Any] = {}
+# Input and output vectorizers per backend, read from the artifact manifests
+_vectorizers: Dict[str, Tuple[Any, Any]] = {}
+# Models inherited through fork() that the child must not use, see _after_fork
+_stale_models: List[Any] = []
+_load_lock = threading.Lock()
+_cache = LRUCache(maxsize=65536)
+_coalescing: Optional[Dict[str, Any]] = None
+_batchers: Dict[Tuple[bool, str], MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+# Async API: inference runs on a dedicated thread, and at most _max_pending
+# inputs per event loop are queued or in flight before callers have to wait.
+# asyncio itself is imported on first use, it roughly triples `import lazydate`.
+ASYNC_CHUNK_SIZE = 1024
+_ASYNC_COALESCING = {"max_wait": 0.0, "max_batch_size": 256}
+_async_executor: Optional[ThreadPoolExecutor] = None
+_max_pending = 8192
+_pending_limits: "weakref.WeakKeyDictionary[Any, _PendingLimit]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class PathInfo(NamedTuple):
+    exact: int
+    model: int
+    gated: int
+
+
+class Candidate(NamedTuple):
+    date: Optional[datetime]
+    confidence: float
+
+
+class ParseResult(NamedTuple):
+    """Best date with its probability under the model, and the top-k candidates"""
+
+    date: Optional[datetime]
+    confidence: float
+    candidates: List[Candidate]
+
+
+_path_counts = {"exact": 0, "model": 0, "gated": 0}
+# Inputs without a digit skip the model, see lazydate.models.gate
+_no_date_gate = True
+_path_lock = threading.Lock()
+
+
+def _load_date_model(backend: str = "numpy"):
+    if backend in _date_models:
+        return _date_models[backend]
+
+    with _load_lock:
+        if backend in _date_models:
+            return _date_models[backend]
+        start = time.perf_counter()
+        # Importing artifact pulls in numpy, so only once a model is needed
+        from lazydate.models.artifact import DEFAULT_MODEL, artifact_path, read_manifest
+
+        date_model: Any
+        if backend == "numpy" or backend in _STUDENT_MODELS:
+            from lazydate.models.numpy_model import NumpyDateModel
+
+            date_model = NumpyDateModel()
+            date_model.load_weights(
+                artifact_path(_STUDENT_MODELS.get(backend, DEFAULT_MODEL))
+            )
+        elif backend == "tensorflow":
+            from lazydate.models.date_model import DateModel
+
+            directory = artifact_path(DEFAULT_MODEL)
+            # Inference only, skip building the optimizer and metrics
+            date_model = DateModel(
+                mask_padding=read_manifest(directory)["mask_padding"], compile=False
+            )
+            date_model.load_weights(directory)
+        else:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        _date_models[backend] = date_model
+
+        sink = metrics._sink
+        if sink is not None:
+            sink.observe(
+                "lazydate_model_load_seconds",
+                time.perf_counter() - start,
+                {"backend": backend},
+            )
+        return date_model
+
+
+def _load_vectorizers(backend: str = "numpy") -> Tuple[Any, Any]:
+    """
+    Input and output vectorizers of the backend's model, built from its artifact
+    manifest without loading the weights (e.g. for the Pool parent, which only
+    vectorizes)
+    """
+    if backend in _vectorizers:
+        return _vectorizers[backend]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+    from lazydate.models.artifact import DEFAULT_MODEL, artifact_path, read_manifest
+    from lazydate.models.vectorizer import CharVectorizer
+
+    manifest = read_manifest(artifact_path(_STUDENT_MODELS.get(backend, DEFAULT_MODEL)))
+    _vectorizers[backend] = (
+        CharVectorizer(
+            vocabulary=manifest["vocabulary"],
+            max_sequence_len=manifest["max_sequence_len"],
+            mask_padding=manifest["mask_padding"],
+        ),
+        CharVectorizer(
+            vocabulary=manifest["output_vocabulary"],
+            max_sequence_len=manifest["output_sequence_len"],
+        ),
+    )
+    return _vectorizers[backend]
+
+
+def warmup(backend: str = "numpy"):
+    """Load the model and run one dummy batch ahead of the first parse"""
+    _load_date_model(backend).predict_on_batch(["1 january 2000"])
+
+
+def preload(backend: str = "numpy", freeze_gc: bool = True):
+    """
+    Load everything parse() needs in a server's master process before it forks
+    workers (e.g. gunicorn --preload). Workers then share the model copy-on-write
+    and skip loading it on their first request.
+
+    TensorFlow can't be used across fork(): for backend="tensorflow" only the
+    library is imported here, and each worker builds its own model on first use.
+
+    :param freeze_gc: gc.freeze() everything allocated so far, so garbage
+        collection in the workers doesn't write to, and so copy, shared pages
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    # Imported by parse_batch on first use
+    import lazydate.dates  # noqa: F401
+
+    if backend in _FORK_SAFE_BACKENDS:
+        warmup(backend)
+    else:
+        import lazydate.models.date_model  # noqa: F401
+    if freeze_gc:
+        gc.collect()
+        gc.freeze()
+
+
+def _after_fork():
+    """
+    Runs in forked children. Threads aren't copied by fork(), so locks one of
+    them held would never be released and batcher/executor threads are gone.
+    """
+    global _load_lock, _batchers_lock, _path_lock, _async_executor
+    _load_lock = threading.Lock()
+    _batchers_lock = threading.Lock()
+    _path_lock = threading.Lock()
+    _cache.reset_lock()
+    if metrics._sink is not None:
+        metrics._sink.after_fork()
+    # Recreated on next use, closing them would wait on the parent's threads
+    _batchers.clear()
+    _async_executor = None
+    _pending_limits.clear()
+    for backend in list(_date_models):
+        if backend not in _FORK_SAFE_BACKENDS:
+            # Still referenced, so the child never runs TensorFlow destructors
+            # that could wait on runtime threads left in the parent
+            _stale_models.append(_date_models.pop(backend))
+
+
+if hasattr(os, "register_at_fork"):
+    # Not on Windows
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def cache_info() -> CacheInfo:
+    """Hit, miss and eviction counters for the parse result cache"""
+    return _cache.info()
+
+
+def set_cache_size(maxsize: int):
+    """Resize the parse result cache, evicting as needed. 0 disables caching."""
+    _cache.resize(maxsize)
+
+
+def clear_cache():
+    """Empty the parse result cache and reset its counters"""
+    _cache.clear()
+
+
+def enable_coalescing(max_wait: float = 0.002, max_batch_size: int = 256):
+    """
+    Merge concurrent parse() calls into shared model batches. Each batch waits at
+    most `max_wait` seconds after its first call for others to join, or until
+    `max_batch_size` calls are queued.
+    """
+    global _coalescing
+    with _batchers_lock:
+        _coalescing = {"max_wait": max_wait, "max_batch_size": max_batch_size}
+        _close_batchers()
+
+
+def disable_coalescing():
+    global _coalescing
+    with _batchers_lock:
+        _coalescing = None
+        _close_batchers()
+
+
+def _close_batchers():
+    for batcher in _batchers.values():
+        batcher.close()
+    _batchers.clear()
+
+
+def _submit_coalesced(
+    text: str, exact: bool, backend: str, always: bool = False
+) -> Optional[Future]:
+    """
+    Queue text on the shared batcher, or return None if coalescing is off.
+    With `always` a batcher is used even when coalescing is off, without
+    waiting for further calls to join a batch.
+    """
+    with _batchers_lock:
+        config = _coalescing
+        if config is None:
+            if not always:
+                return None
+            config = _ASYNC_COALESCING
+        key = (exact, backend)
+        if key not in _batchers:
+            _batchers[key] = MicroBatcher(
+                lambda texts: _predict_datestrs(texts, exact=exact, backend=backend),
+                **config,
+            )
+        return _batchers[key].submit(text)
+
+
+def path_info() -> PathInfo:
+    """
+    Number of inputs resolved by the exact-format parser, by the model and by
+    the no-date gate
+    """
+    with _path_lock:
+        return PathInfo(**_path_counts)
+
+
+def _count_path(path: str, n: int):
+    with _path_lock:
+        _path_counts[path] += n
+
+
+class _PreparedBatch(NamedTuple):
+    datestrs: List[Any]
+    misses: Dict[str, List[int]]
+    inputs: Any
+    lengths: Any
+    namespace: Optional[str]
+
+
+def _observe_stage(sink: metrics.MetricsSink, stage: str, start: float) -> float:
+    """Records the time since `start` as the duration of `stage`, returns now"""
+    now = time.perf_counter()
+    sink.observe("lazydate_stage_seconds", now - start, {"stage": stage})
+    return now
+
+
+def _record_inputs(sink: metrics.MetricsSink, texts: List[str]):
+    lengths = [len(t) for t in texts]
+    sink.observe("lazydate_batch_size", len(texts))
+    sink.observe_many("lazydate_input_length", lengths)
+    truncated = sum(length > MAX_SEQUENCE_LEN for length in lengths)
+    if truncated:
+        sink.increment("lazydate_truncated_inputs_total", truncated)
+
+
+def _record_results(sink: metrics.MetricsSink, datestrs: List[str]):
+    sink.increment("lazydate_inputs_total", len(datestrs))
+    sink.increment("lazydate_no_date_inputs_total", datestrs.count(""))
+
+
+def _cache_key(namespace: Optional[str], key: str) -> Any:
+    return key if namespace is None else (namespace, key)
 
 
-def _load_date_model():
-    global _date_model
-    if not _date_model:
-        _date_model = DateModel()
-        _date_model.load_weights("saved_models/lstm_date_model_v05")
-    return _date_model
+def _prepare_batch(
+    texts: List[str],
+    exact: bool,
+    backend: str,
+    out: Any = None,
+    cache: bool = True,
+    gate: bool = True,
+) -> _PreparedBatch:
+    """
+    Resolves what it can without the model and vectorizes the unique remaining
+    inputs, optionally into the preallocated buffer `out`
 
+    :param cache: look inputs up in the result cache
+    :param gate: answer inputs without a digit "" when the no-date gate is on
+    """
+    sink = metrics._sink
+    if sink is not None:
+        _record_inputs(sink, texts)
+        start = time.perf_counter()
 
-@use_cpu
-def parse(text: str) -> Optional[datetime]:
+    keys = [t[:MAX_SEQUENCE_LEN] for t in texts]
+    datestrs: List = [parse_exact(k) for k in keys] if exact else [None] * len(keys)
+
+    unresolved = [idx for idx, datestr in enumerate(datestrs) if datestr is None]
+    _count_path("exact", len(keys) - len(unresolved))
+
+    namespace = _CACHE_NAMESPACES.get(backend)
+    if cache:
+        cached = _cache.get_many(_cache_key(namespace, keys[idx]) for idx in unresolved)
+    else:
+        cached = [MISSING] * len(unresolved)
+    misses: Dict[str, List[int]] = {}
+    for idx, datestr in zip(unresolved, cached):
+        datestrs[idx] = datestr
+        if datestr is MISSING:
+            misses.setdefault(keys[idx], []).append(idx)
+    if sink is not None:
+        start = _observe_stage(sink, "exact", start)
+
+    inputs = lengths = None
+    gated = 0
+    if misses:
+        vectorizer = _load_vectorizers(backend)[0]
+        inputs = vectorizer.transform(list(misses), out=out)
+        lengths = vectorizer.lengths(list(misses))
+        if gate and _no_date_gate:
+            misses, inputs, lengths, gated = _gate_batch(
+                datestrs, misses, inputs, lengths, vectorizer
+            )
+        if sink is not None:
+            _observe_stage(sink, "vectorize", start)
+    _count_path("model", len(unresolved) - gated)
+    _count_path("gated", gated)
+    if sink is not None and gated:
+        sink.increment("lazydate_gated_inputs_total", gated)
+    return _PreparedBatch(datestrs, misses, inputs, lengths, namespace)
+
+
+def _gate_batch(
+    datestrs: List[Any],
+    misses: Dict[str, List[int]],
+    inputs: Any,
+    lengths: Any,
+    vectorizer: Any,
+) -> Tuple[Dict[str, List[int]], Any, Any, int]:
+    """
+    Answers "" for misses without a digit and drops them from the model inputs
+
+    :return: the remaining misses, their inputs and lengths, and the number of
+        inputs (counting duplicates) that were gated
+    """
+    from lazydate.models.gate import may_contain_date
+
+    keep = may_contain_date(inputs, vectorizer)
+    if keep.all():
+        return misses, inputs, lengths, 0
+    gated = 0
+    kept: Dict[str, List[int]] = {}
+    for (key, idxs), has_digit in zip(misses.items(), keep.tolist()):
+        if has_digit:
+            kept[key] = idxs
+            continue
+        gated += len(idxs)
+        for idx in idxs:
+            datestrs[idx] = ""
+    # Compacted in place: inputs may be a view of the caller's buffer, which
+    # Pool workers read from shared memory
+    n = len(kept)
+    inputs[:n] = inputs[keep]
+    return kept, inputs[:n], lengths[keep], gated
+
+
+def _finish_batch(batch: _PreparedBatch, backend: str) -> List[str]:
+    """Runs the model on a prepared batch and fills in its date strings"""
+    sink = metrics._sink
+    if batch.misses:
+        date_model = _load_date_model(backend)
+        if sink is None:
+            predictions = date_model.predict_encoded(batch.inputs, batch.lengths)
+        else:
+            start = time.perf_counter()
+            indices = date_model.predict_indices(batch.inputs, batch.lengths)
+            start = _observe_stage(sink, "predict", start)
+            predictions = date_model.output_vectorizer.inverse_transform(indices)
+            _observe_stage(sink, "decode", start)
+        _fill_batch(batch, predictions)
+    if sink is not None:
+        _record_results(sink, batch.datestrs)
+    return batch.datestrs
+
+
+def _fill_batch(batch: _PreparedBatch, predictions: List[str]) -> List[str]:
+    """Scatters model predictions for the unique misses back into the batch"""
+    datestrs = batch.datestrs
+    for key, datestr in zip(batch.misses, predictions):
+        for idx in batch.misses[key]:
+            datestrs[idx] = datestr
+    keys = (_cache_key(batch.namespace, key) for key in batch.misses)
+    _cache.put_many(zip(keys, predictions))
+    return datestrs
+
+
+def _predict_datestrs(
+    texts: List[str], exact: bool = True, backend: str = "numpy"
+) -> List[str]:
+    """
+    "%Y%m%d" date strings ("" for no date) for each input. Clean dates are resolved
+    by the exact-format parser when `exact` is set, the rest are served from the
+    cache where possible and only unique cache misses are sent to the model.
+    The numpy and tensorflow backends run the same weights, so they share cache
+    entries, the other backends are cached separately.
+    """
+    return _finish_batch(_prepare_batch(texts, exact, backend), backend)
+
+
+def _predict_candidates(
+    texts: List[str], exact: bool, backend: str, top_k: int
+) -> List[ParseResult]:
+    """
+    Top-k calendar-valid dates per input from the model's output probabilities.
+    Exact-format matches have confidence 1. The result cache only holds argmax
+    date strings, and the no-date gate has no candidates to offer, so both are
+    bypassed.
+    """
+    batch = _prepare_batch(texts, exact, backend, cache=False, gate=False)
+    results: List[Any] = [None] * len(texts)
+    for idx, datestr in enumerate(batch.datestrs):
+        if datestr is not MISSING and datestr is not None:
+            date = _to_datetime(datestr)
+            results[idx] = ParseResult(date, 1.0, [Candidate(date, 1.0)])
+
+    sink = metrics._sink
+    if batch.misses:
+        from lazydate.decoding import top_k_dates
+
+        start = time.perf_counter()
+        proba = _load_date_model(backend).predict_proba(batch.inputs, batch.lengths)
+        if sink is not None:
+            start = _observe_stage(sink, "predict", start)
+        datestrs, confidences = top_k_dates(proba, top_k)
+        if sink is not None:
+            _observe_stage(sink, "decode", start)
+
+        for key, row_datestrs, row_confidences in zip(
+            batch.misses, datestrs, confidences
+        ):
+            candidates = [
+                Candidate(_to_datetime(d), float(c))
+                for d, c in zip(row_datestrs, row_confidences)
+            ]
+            result = ParseResult(
+                candidates[0].date, candidates[0].confidence, candidates
+            )
+            for idx in batch.misses[key]:
+                results[idx] = result
+                batch.datestrs[idx] = row_datestrs[0]
+    if sink is not None:
+        _record_results(sink, batch.datestrs)
+    return results
+
+
+def parse(text: str, exact: bool = True, backend: str = "numpy") -> Optional[datetime]:
+    """
+    :param exact: resolve clean dates with the exact-format parser
+    :param backend: "numpy" or "tensorflow" model implementation, or the
+        smaller distilled "numpy-cnn" and "numpy-gru" (see benchmarks/distillation.py
+        for their accuracy and latency)
+    """
     if len(text) > MAX_SEQUENCE_LEN:
         logger.warning(
             "Input to lazydate.parse is longer than max sequence length - "
             f"{len(text)} > {MAX_SEQUENCE_LEN} - input will be truncated"
         )
 
-    date_model = _load_date_model()
-    datestr = date_model.predict(text)
-    if datestr == "":
+    future = _submit_coalesced(text, exact, backend)
+    if future is not None:
+        datestr = future.result()
+    else:
+        datestr = _predict_datestrs([text], exact=exact, backend=backend)[0]
+
+    sink = metrics._sink
+    if sink is None:
+        return _to_datetime(datestr)
+    start = time.perf_counter()
+    date = _to_datetime(datestr)
+    _observe_stage(sink, "convert", start)
+    return date
+
+
+def _to_datetime(datestr: str) -> Optional[datetime]:
+    """Single-item lazydate.dates.to_datetimes, None for no date or invalid output"""
+    try:
+        return datetime(int(datestr[:4]), int(datestr[4:6]), int(datestr[6:]))
+    except ValueError:
         return None
-    return datetime.strptime(datestr, "%Y%m%d")
 
 
-@use_cpu
-def parse_batch(texts: List[str]) -> List[Optional[datetime]]:
-    if len(texts) == 0:
+def parse_batch(
+    texts: List[str],
+    exact: bool = True,
+    backend: str = "numpy",
+    return_confidence: bool = False,
+    top_k: int = 1,
+    as_datetime64: bool = False,
+) -> Any:
+    """
+    Model outputs that are not valid dates (e.g. "20201399") parse as None.
+
+    :param return_confidence: return a ParseResult per input instead of a date.
+        Model outputs are then decoded to the most probable valid calendar
+        dates rather than taken character by character.
+    :param top_k: candidates per ParseResult
+    :param as_datetime64: return a numpy datetime64[D] array with NaT for no
+        date instead of a list of datetimes
+    """
+    if return_confidence and as_datetime64:
+        raise ValueError("return_confidence and as_datetime64 can't be combined")
+    if len(texts) == 0 and not as_datetime64:
         return []
 
-    max_length = max([len(t) for t in texts])
+    max_length = max([len(t) for t in texts], default=0)
     if max_length > MAX_SEQUENCE_LEN:
         logger.warning(
             "Longest input to lazydate.parse_batch is longer than max sequence length - "
             f"{max_length} > {MAX_SEQUENCE_LEN} - input will be truncated"
         )
 
-    date_model = _load_date_model()
-    datestrs = date_model.predict_on_batch(texts)
-    dates = [datetime.strptime(d, "%Y%m%d") if d != "" else None for d in datestrs]
+    if return_confidence:
+        return _predict_candidates(texts, exact, backend, top_k)
+    from lazydate.dates import to_datetime64, to_datetimes
+
+    datestrs = _predict_datestrs(texts, exact=exact, backend=backend)
+    sink = metrics._sink
+    start = time.perf_counter()
+    dates = to_datetime64(datestrs) if as_datetime64 else to_datetimes(datestrs)
+    if sink is not None:
+        _observe_stage(sink, "convert", start)
+    return dates
+
+
+def parse_stream(
+    texts: Iterable[str],
+    batch_size: int = 1024,
+    exact: bool = True,
+    backend: str = "numpy",
+    prefetch: bool = False,
+) -> Iterator[Optional[datetime]]:
+    """
+    Lazily parse an iterable of strings (e.g. a file object or CSV column) in
+    chunks of `batch_size`, yielding results in input order. Memory stays bounded
+    by two chunks however long the input is.
+
+    :param prefetch: read and vectorize the next chunk on a background thread
+        while the current one is in inference
+    """
+    import numpy as np
+
+    from lazydate.dates import to_datetimes
+
+    iterator = iter(texts)
+    vectorizer = _load_vectorizers(backend)[0]
+    # Two buffers, so the next chunk can be vectorized while the model reads the
+    # current one
+    buffers = [
+        np.zeros((batch_size, vectorizer.max_sequence_len), dtype=np.int32)
+        for _ in range(2)
+    ]
+    warned = False
+
+    def prepare(buffer_idx: int) -> Optional[_PreparedBatch]:
+        nonlocal warned
+        chunk = list(itertools.islice(iterator, batch_size))
+        if not chunk:
+            return None
+        if not warned and max(len(t) for t in chunk) > MAX_SEQUENCE_LEN:
+            warned = True
+            logger.warning(
+                "Input to lazydate.parse_stream is longer than max sequence length "
+                f"- {MAX_SEQUENCE_LEN} - input will be truncated"
+            )
+        return _prepare_batch(chunk, exact, backend, out=buffers[buffer_idx])
+
+    if not prefetch:
+        while True:
+            batch = prepare(0)
+            if batch is None:
+                return
+            yield from to_datetimes(_finish_batch(batch, backend))
+
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="lazydate-stream"
+    ) as pool:
+        buffer_idx = 0
+        pending = pool.submit(prepare, buffer_idx)
+        while True:
+            batch = pending.result()
+            if batch is None:
+                return
+            buffer_idx = 1 - buffer_idx
+            pending = pool.submit(prepare, buffer_idx)
+            yield from to_datetimes(_finish_batch(batch, backend))
+
+
+def set_no_date_gate(enabled: bool):
+    """
+    Turn the no-date gate on or off. With it on (the default) inputs without a
+    digit are parsed as None without running the model.
+    """
+    global _no_date_gate
+    _no_date_gate = enabled
+
+
+def set_max_pending(max_pending: int):
+    """
+    Bound the number of inputs queued or in flight through aparse/aparse_batch
+    per event loop. Further callers wait until capacity frees up.
+    """
+    global _max_pending
+    _max_pending = max_pending
+    _pending_limits.clear()
+
+
+def _get_async_executor() -> ThreadPoolExecutor:
+    global _async_executor
+    with _batchers_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="lazydate-async"
+            )
+        return _async_executor
+
+
+class _PendingLimit:
+    """
+    Per-event-loop count of pending async inputs. Each reservation is granted
+    whole and in arrival order, so callers can't each hold part of the limit
+    while waiting for the rest.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[int, "asyncio.Future"]] = collections.deque()
+
+    async def acquire(self, n: int) -> int:
+        """Reserve n slots (capped at the limit), returning how many were taken"""
+        import asyncio
+
+        n = min(n, self.limit)
+        if not self._waiters and self.in_flight + n <= self.limit:
+            self.in_flight += n
+            return n
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((n, waiter))
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the caller was cancelled
+                self.release(n)
+            else:
+                self._waiters.remove((n, waiter))
+                self._wake()
+            raise
+        return n
+
+    def release(self, n: int):
+        self.in_flight -= n
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight + self._waiters[0][0] <= self.limit:
+            n, waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += n
+                waiter.set_result(None)
+
+
+def _pending_limit() -> _PendingLimit:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    if loop not in _pending_limits:
+        _pending_limits[loop] = _PendingLimit(_max_pending)
+    return _pending_limits[loop]
+
+
+async def aparse(
+    text: str, exact: bool = True, backend: str = "numpy"
+) -> Optional[datetime]:
+    """
+    Async parse(). Concurrent awaiting callers are coalesced into shared model
+    batches that run off the event loop.
+    """
+    if len(text) > MAX_SEQUENCE_LEN:
+        logger.warning(
+            "Input to lazydate.aparse is longer than max sequence length - "
+            f"{len(text)} > {MAX_SEQUENCE_LEN} - input will be truncated"
+        )
+
+    import asyncio
+
+    limit = _pending_limit()
+    acquired = await limit.acquire(1)
+    try:
+        future = _submit_coalesced(text, exact, backend, always=True)
+        assert future is not None
+        datestr = await asyncio.wrap_future(future)
+    finally:
+        limit.release(acquired)
+    return _to_datetime(datestr)
+
+
+async def aparse_batch(
+    texts: List[str], exact: bool = True, backend: str = "numpy"
+) -> List[Optional[datetime]]:
+    """
+    Async parse_batch(). Inputs run in chunks of ASYNC_CHUNK_SIZE on a dedicated
+    thread, so cancelling the call stops before the next chunk.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    executor = _get_async_executor()
+    limit = _pending_limit()
+    dates: List[Optional[datetime]] = []
+    for start in range(0, len(texts), ASYNC_CHUNK_SIZE):
+        chunk = texts[start : start + ASYNC_CHUNK_SIZE]
+        acquired = await limit.acquire(len(chunk))
+        try:
+            dates += await loop.run_in_executor(
+                executor, lambda: parse_batch(chunk, exact=exact, backend=backend)
+            )
+        finally:
+            limit.release(acquired)
     return dates
@@ -0,0 +1,190 @@
+import contextlib
+import ctypes
+import multiprocessing
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from lazydate import metrics, parser
+from lazydate.dates import to_datetimes
+from lazydate.models.config import OUTPUT_SEQUENCE_LEN
+
+# Environment variables read by the BLAS/OpenMP runtimes numpy may link against
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Per-process state of pool workers, set by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+@contextlib.contextmanager
+def _thread_env(n_threads: int) -> Iterator[None]:
+    """Temporarily set BLAS/OpenMP thread counts, inherited by spawned workers"""
+    previous = {k: os.environ.get(k) for k in _THREAD_ENV_VARS}
+    os.environ.update({k: str(n_threads) for k in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for k, v in previous.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _shared_view(raw: Any, dtype: Any, shape: tuple) -> np.ndarray:
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+
+def _init_worker(
+    inputs: Any,
+    lengths: Any,
+    outputs: Any,
+    capacity: int,
+    seq_len: int,
+    backend: str,
+    intra_op_threads: int,
+    inter_op_threads: int,
+):
+    if backend == "tensorflow":
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+    _worker["model"] = parser._load_date_model(backend)
+    _worker["inputs"] = _shared_view(inputs, np.int32, (capacity, seq_len))
+    _worker["lengths"] = _shared_view(lengths, np.int32, (capacity,))
+    _worker["outputs"] = _shared_view(outputs, np.int8, (capacity, OUTPUT_SEQUENCE_LEN))
+
+
+def _predict_slice(bounds: tuple):
+    start, stop = bounds
+    _worker["outputs"][start:stop] = _worker["model"].predict_indices(
+        _worker["inputs"][start:stop], _worker["lengths"][start:stop]
+    )
+
+
+class Pool:
+    """
+    Process pool for parse_batch on multi-core hosts.
+
+    Each worker loads the model once. Inputs are vectorized by the parent into
+    shared memory and workers write argmax indices back into a shared output
+    buffer, so no arrays are pickled. The exact-format parser and result cache
+    run in the parent as for lazydate.parse_batch. The buffers are shared by
+    every call, so parse_batch calls from several threads take turns.
+
+    with lazydate.Pool(workers=8) as pool:
+        dates = pool.parse_batch(texts)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        backend: str = "numpy",
+        intra_op_threads: int = 1,
+        inter_op_threads: int = 1,
+        capacity: int = 65536,
+    ):
+        """
+        :param workers: number of processes, defaults to os.cpu_count()
+        :param intra_op_threads: threads per worker for a single op (BLAS/OpenMP
+            for the numpy backend, TensorFlow intra-op pool otherwise)
+        :param inter_op_threads: TensorFlow inter-op threads per worker
+        :param capacity: rows in the shared buffers, larger batches run in rounds
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.capacity = capacity
+        # Guards the shared buffers from prepare through to decode
+        self._lock = threading.Lock()
+
+        # The parent only vectorizes, the workers hold their own model copies
+        vectorizer = parser._load_vectorizers(backend)[0]
+        seq_len = vectorizer.max_sequence_len
+
+        # spawn rather than fork: TensorFlow is not fork-safe
+        ctx = multiprocessing.get_context("spawn")
+        self._inputs_raw = ctx.RawArray(ctypes.c_int32, capacity * seq_len)
+        self._lengths_raw = ctx.RawArray(ctypes.c_int32, capacity)
+        self._outputs_raw = ctx.RawArray(ctypes.c_int8, capacity * OUTPUT_SEQUENCE_LEN)
+        self._inputs = _shared_view(self._inputs_raw, np.int32, (capacity, seq_len))
+        self._lengths = _shared_view(self._lengths_raw, np.int32, (capacity,))
+        self._outputs = _shared_view(
+            self._outputs_raw, np.int8, (capacity, OUTPUT_SEQUENCE_LEN)
+        )
+
+        with _thread_env(intra_op_threads):
+            self._pool = ctx.Pool(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(
+                    self._inputs_raw,
+                    self._lengths_raw,
+                    self._outputs_raw,
+                    capacity,
+                    seq_len,
+                    backend,
+                    intra_op_threads,
+                    inter_op_threads,
+                ),
+            )
+
+    def parse_batch(
+        self, texts: List[str], exact: bool = True
+    ) -> List[Optional[datetime]]:
+        dates: List[Optional[datetime]] = []
+        for start in range(0, len(texts), self.capacity):
+            chunk = texts[start : start + self.capacity]
+            with self._lock:
+                datestrs = self._predict_datestrs(chunk, exact)
+            dates += to_datetimes(datestrs)
+        return dates
+
+    def _predict_datestrs(self, texts: List[str], exact: bool) -> List[str]:
+        batch = parser._prepare_batch(texts, exact, self.backend, out=self._inputs)
+        n = len(batch.misses)
+        sink = metrics._sink
+        if n > 0:
+            self._lengths[:n] = batch.lengths
+
+            # A few slices per worker evens out uneven slice run times
+            start = time.perf_counter()
+            n_slices = min(n, self.workers * 4)
+            bounds = np.linspace(0, n, n_slices + 1).astype(int)
+            self._pool.map(_predict_slice, list(zip(bounds[:-1], bounds[1:])))
+            if sink is not None:
+                start = parser._observe_stage(sink, "predict", start)
+
+            output_vectorizer = parser._load_vectorizers(self.backend)[1]
+            predictions = output_vectorizer.inverse_transform(self._outputs[:n])
+            if sink is not None:
+                parser._observe_stage(sink, "decode", start)
+            parser._fill_batch(batch, predictions)
+        if sink is not None:
+            parser._record_results(sink, batch.datestrs)
+        return batch.datestrs
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self) -> "Pool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.terminate()
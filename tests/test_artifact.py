@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import lazydate
+from lazydate import parser
+from lazydate.models import NumpyDateModel
+from lazydate.models.artifact import (
+    DEFAULT_MODEL,
+    MANIFEST,
+    artifact_path,
+    load_arrays,
+    read_manifest,
+    save_artifact,
+)
+
+TEXTS = ["8 dec 20", "the date is 12th nov 1982", "lazydate", "20./n0vembr/2020"]
+
+
+@pytest.fixture
+def npz(tmp_path):
+    """The packaged weights as an .npz, as written by save_numpy_weights"""
+    fn = str(tmp_path / "weights.npz")
+    np.savez(
+        fn,
+        mask_padding=read_manifest(artifact_path())["mask_padding"],
+        **load_arrays(artifact_path(), mmap=False),
+    )
+    return fn
+
+
+def test_packaged_artifact_matches_npz(npz):
+    manifest = read_manifest(artifact_path())
+    assert manifest["name"] == DEFAULT_MODEL
+
+    from_artifact = NumpyDateModel()
+    from_artifact.load_weights(artifact_path())
+    from_npz = NumpyDateModel()
+    from_npz.load_weights(npz)
+    assert from_artifact.predict_on_batch(TEXTS) == from_npz.predict_on_batch(TEXTS)
+
+
+def test_weights_are_memory_mapped():
+    arrays = load_arrays(artifact_path())
+    assert all(isinstance(a, np.memmap) for a in arrays.values())
+    assert not any(
+        isinstance(a, np.memmap)
+        for a in load_arrays(artifact_path(), mmap=False).values()
+    )
+
+    date_model = NumpyDateModel()
+    date_model.load_weights(artifact_path())
+    # Used in place, without a copy
+    assert isinstance(date_model._decoder_kernel.base, np.memmap)
+
+
+def test_save_artifact(tmp_path, npz):
+    directory = str(tmp_path / "model_v06")
+    save_artifact(npz, directory)
+    manifest = read_manifest(directory)
+    assert manifest["name"] == "model_v06"
+    assert load_arrays(directory)["dense_kernel"].dtype == np.float32
+
+    manifest["format_version"] += 1
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError, match="format version"):
+        read_manifest(directory)
+
+
+def test_parse_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "_date_models", {})
+    monkeypatch.chdir(tmp_path)
+    lazydate.clear_cache()
+    assert lazydate.parse("20./n0vembr/2020", exact=False).year == 2020
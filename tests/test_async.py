@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+import lazydate as ld
+
+
+def test_aparse_matches_parse():
+    texts = ["20./n0vembr/2020", "the date is 12th nov 1982", "lazydate", "8 dec 20"]
+    expected = [ld.parse(t) for t in texts]
+
+    async def main():
+        return await asyncio.gather(*(ld.aparse(t) for t in texts))
+
+    assert asyncio.run(main()) == expected
+
+
+def test_aparse_batch_keeps_loop_responsive():
+    texts = [
+        f"the event happened on {i % 28 + 1} dec '{i % 100:02d}" for i in range(3000)
+    ]
+    ld.clear_cache()
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        dates = await ld.aparse_batch(texts, exact=False)
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+        return dates, ticks, elapsed
+
+    dates, ticks, elapsed = asyncio.run(main())
+    assert len(dates) == len(texts)
+    assert dates[0] == datetime(2000, 12, 1)
+    # The ticker should get a fair share of the loop while inference runs
+    assert ticks >= elapsed / 0.01 / 4
+
+
+def test_aparse_batch_cancellation():
+    texts = [f"text number {i} with date {i % 28 + 1}/12/1999" for i in range(5000)]
+    ld.clear_cache()
+
+    async def main():
+        task = asyncio.create_task(ld.aparse_batch(texts, exact=False))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert ld.cache_info().currsize < len(texts)
+
+
+def test_backpressure():
+    ld.set_max_pending(2)
+    try:
+
+        async def main():
+            return await asyncio.gather(
+                *(ld.aparse(f"{i + 1}./n0vembr/2020") for i in range(10))
+            )
+
+        dates = asyncio.run(main())
+    finally:
+        ld.set_max_pending(8192)
+    assert len(dates) == 10
+
+
+@pytest.mark.parametrize("max_pending, n_calls", [(8192, 12), (1500, 4)])
+def test_concurrent_aparse_batch_share_limit(max_pending, n_calls):
+    # Clean dates take the exact-format path, so only the limit is exercised
+    batches = [
+        [f"{1900 + (c * 4096 + i) % 200}-{i % 12 + 1:02d}-08" for i in range(4096)]
+        for c in range(n_calls)
+    ]
+    ld.set_max_pending(max_pending)
+    try:
+
+        async def main():
+            return await asyncio.wait_for(
+                asyncio.gather(*(ld.aparse_batch(b) for b in batches)), timeout=60
+            )
+
+        results = asyncio.run(main())
+    finally:
+        ld.set_max_pending(8192)
+    assert [len(dates) for dates in results] == [4096] * n_calls
+    assert results[0][0] == datetime(1900, 1, 8)
+
+
+def test_pending_limit_cancelled_waiter():
+    from lazydate.parser import _PendingLimit
+
+    async def main():
+        limit = _PendingLimit(4)
+        assert await limit.acquire(3) == 3
+        blocked = asyncio.create_task(limit.acquire(4))
+        small = asyncio.create_task(limit.acquire(1))
+        await asyncio.sleep(0)
+        # Waiters are served in order, so the small one queues behind
+        assert not blocked.done() and not small.done()
+        blocked.cancel()
+        assert await small == 1
+        limit.release(4)
+        assert limit.in_flight == 0
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
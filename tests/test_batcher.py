@@ -0,0 +1,49 @@
+import threading
+import time
+
+from lazydate.batcher import MicroBatcher
+
+
+def test_concurrent_submits_are_coalesced():
+    calls = []
+
+    def fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(fn, max_wait=0.05, max_batch_size=64)
+    barrier = threading.Barrier(16)
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher.submit(i).result(timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert results == {i: i * 2 for i in range(16)}
+    assert sum(len(call) for call in calls) == 16
+    assert len(calls) < 16
+
+
+def test_max_batch_size_and_errors():
+    def fn(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return items
+
+    batcher = MicroBatcher(fn, max_wait=1.0, max_batch_size=2)
+    start = time.monotonic()
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    assert [f.result(timeout=5) for f in futures] == ["a", "b"]
+    assert time.monotonic() - start < 1.0
+
+    batcher.max_wait = 0.0
+    bad = batcher.submit("bad")
+    assert isinstance(bad.exception(timeout=5), ValueError)
+    batcher.close()
@@ -0,0 +1,55 @@
+import json
+import sys
+
+import pytest
+
+from benchmarks import inference
+
+BASELINE = {
+    "meta": {"seed": 0},
+    "latency": {"p50_ms": 2.0, "p99_ms": 0.0},
+    "throughput": {"clean": {"batch_64_per_s": 1000.0}},
+    "peak_rss_mb": 100.0,
+}
+
+
+def _report(p50_ms: float, per_s: float) -> dict:
+    return {
+        "meta": {"seed": 1},
+        "latency": {"p50_ms": p50_ms, "p99_ms": 5.0},
+        "throughput": {"clean": {"batch_64_per_s": per_s}},
+        "peak_rss_mb": 100.0,
+    }
+
+
+def test_compare():
+    # Slower latency and lower throughput are both regressions, a zero
+    # baseline is skipped
+    regressions = inference.compare(_report(3.0, 700.0), BASELINE, tolerance=0.2)
+    assert sorted(regressions) == ["latency.p50_ms", "throughput.clean.batch_64_per_s"]
+    assert regressions["latency.p50_ms"]["change"] == pytest.approx(0.5)
+    assert regressions["throughput.clean.batch_64_per_s"] == {
+        "baseline": 1000.0,
+        "current": 700.0,
+        "change": pytest.approx(0.3),
+    }
+
+    # Faster, higher throughput or within tolerance
+    assert inference.compare(_report(1.0, 5000.0), BASELINE, tolerance=0.2) == {}
+    assert inference.compare(_report(2.2, 900.0), BASELINE, tolerance=0.2) == {}
+
+
+@pytest.mark.parametrize("per_s, status", [(1100.0, None), (500.0, 1)])
+def test_exit_status(tmp_path, monkeypatch, per_s, status):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(BASELINE))
+    monkeypatch.setattr(inference, "run_suite", lambda *args: _report(2.0, per_s))
+    monkeypatch.setattr(
+        sys, "argv", ["inference", "--baseline", str(baseline), "--tolerance", "0.2"]
+    )
+    if status is None:
+        inference.main()
+    else:
+        with pytest.raises(SystemExit) as exc_info:
+            inference.main()
+        assert exc_info.value.code == status
@@ -0,0 +1,48 @@
+import threading
+
+from lazydate.cache import MISSING, LRUCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(maxsize=2)
+    cache.put_many([("a", 1), ("b", 2)])
+    assert cache.get_many(["a", "c"]) == [1, MISSING]
+
+    cache.put_many([("c", 3)])  # evicts "b", the least recently used
+    assert cache.get_many(["b", "a", "c"]) == [MISSING, 1, 3]
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (3, 2, 1)
+    assert (info.maxsize, info.currsize) == (2, 2)
+
+
+def test_resize_and_disable():
+    cache = LRUCache(maxsize=4)
+    cache.put_many([(str(i), i) for i in range(4)])
+    cache.resize(1)
+    assert cache.info().currsize == 1
+    assert cache.get_many(["3"]) == [3]
+
+    cache.resize(0)
+    cache.put_many([("x", 0)])
+    assert cache.info().currsize == 0
+    assert cache.get_many(["x"]) == [MISSING]
+
+
+def test_thread_safety():
+    cache = LRUCache(maxsize=100)
+
+    def worker(offset):
+        for i in range(1000):
+            cache.put_many([(str((offset + i) % 300), i)])
+            cache.get_many([str(i % 300)])
+
+    threads = [threading.Thread(target=worker, args=(i * 37,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = cache.info()
+    assert info.currsize == 100
+    assert info.hits + info.misses == 8000
@@ -0,0 +1,43 @@
+import sys
+
+import numpy as np
+import pytest
+
+import lazydate as ld
+
+values = ["22 aug 93", None, "lazydate", np.nan, "22 aug 93", "1 jan 2300"]
+expected = np.array(
+    ["1993-08-22", "NaT", "NaT", "NaT", "1993-08-22", "NaT"], dtype="datetime64[ns]"
+)
+
+
+def test_parse_series():
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(values, index=list("abcdef"), name="date")
+    dates = ld.parse_series(series)
+    assert dates.dtype == "datetime64[ns]"
+    assert list(dates.index) == list("abcdef")
+    assert dates.name == "date"
+    np.testing.assert_array_equal(dates.to_numpy(), expected)
+
+
+def test_parse_array_without_pandas(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    dates = ld.parse_array(np.array(values, dtype=object))
+    np.testing.assert_array_equal(dates, expected)
+
+
+def test_parse_array_pyarrow():
+    pa = pytest.importorskip("pyarrow")
+    array = pa.chunked_array([values[:3], [None, values[4], values[5]]])
+    np.testing.assert_array_equal(ld.parse_array(array), expected)
+
+
+def test_parse_array_runs_unique_values():
+    before = ld.path_info()
+    ld.parse_array(["22 aug 93"] * 1000 + ["lazydate"] * 1000)
+    after = ld.path_info()
+    assert after.exact - before.exact == 1
+    # "lazydate" has no digit, so the no-date gate answers it
+    assert after.model - before.model == 0
+    assert after.gated - before.gated == 1
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.data_generation.corpus import read_manifest, shard_paths, write_corpus
+from lazydate.models.config import MODEL_INPUT_NAME, MODEL_OUTPUT_NAME
+from lazydate.models.generator import CorpusSequence
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    sentences = ["The quick brown fox jumps over the lazy dog .", "It rained ."]
+    monkeypatch.setattr(data_generation, "wiki_sentences", sentences)
+    write_corpus(str(tmp_path / "a"), 250, shard_size=100, seed=0)
+    return str(tmp_path / "a")
+
+
+def _load(directory):
+    n_shards = len(read_manifest(directory)["shard_sizes"])
+    paths = [shard_paths(directory, shard) for shard in range(n_shards)]
+    inputs = np.concatenate([np.load(p["inputs"]) for p in paths])
+    outputs = np.concatenate([np.load(p["outputs"]) for p in paths])
+    return inputs, outputs
+
+
+def test_write_corpus(corpus, tmp_path):
+    manifest = read_manifest(corpus)
+    assert manifest["shard_sizes"] == [100, 100, 50]
+    inputs, outputs = _load(corpus)
+    assert inputs.shape == (250, 200) and inputs.dtype == np.int32
+    assert outputs.shape == (250, 8) and outputs.dtype == np.int32
+
+    metadata = np.load(shard_paths(corpus, 2)["metadata"])
+    assert all(len(metadata[key]) == 50 for key in metadata.files)
+
+    write_corpus(str(tmp_path / "b"), 250, shard_size=100, seed=0)
+    for a, b in zip(_load(corpus), _load(str(tmp_path / "b"))):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_corpus_sequence(corpus):
+    inputs, outputs = _load(corpus)
+    sequence = CorpusSequence(corpus, batch_size=32, shuffle=True, seed=0)
+    assert len(sequence) == 8
+
+    seen_inputs, seen_outputs = [], []
+    for idx in range(len(sequence)):
+        x, y = sequence[idx]
+        seen_inputs.append(x[MODEL_INPUT_NAME])
+        seen_outputs.append(y[MODEL_OUTPUT_NAME])
+    seen_inputs = np.concatenate(seen_inputs)
+    seen_outputs = np.concatenate(seen_outputs)
+
+    # Every example exactly once, with its own target
+    order = np.lexsort(seen_inputs.T[::-1])
+    expected_order = np.lexsort(inputs.T[::-1])
+    np.testing.assert_array_equal(seen_inputs[order], inputs[expected_order])
+    np.testing.assert_array_equal(seen_outputs[order], outputs[expected_order])
+
+    first_batch = sequence[0][0][MODEL_INPUT_NAME]
+    sequence.on_epoch_end()
+    assert not np.array_equal(sequence[0][0][MODEL_INPUT_NAME], first_batch)
+
+
+def test_fit_rejects_mismatched_corpus(corpus):
+    from lazydate.models.date_model import DateModel
+
+    with pytest.raises(ValueError, match="mask_padding"):
+        DateModel(mask_padding=True).fit(corpus=corpus, epochs=1)
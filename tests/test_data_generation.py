@@ -0,0 +1,52 @@
+import datetime
+import random
+
+import pytest
+from babel import dates
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.data_generation import BatchRandom, format_datetime, generate_dates
+
+
+@pytest.fixture
+def wiki_sentences(monkeypatch):
+    sentences = ["The quick brown fox jumps over the lazy dog .", "It rained ."]
+    monkeypatch.setattr(data_generation, "wiki_sentences", sentences)
+
+
+def test_generate_dates_is_reproducible(wiki_sentences):
+    examples = generate_dates(200, seed=0, chunk_size=64)
+    assert generate_dates(200, seed=0, chunk_size=64) == examples
+    assert generate_dates(200, seed=0, chunk_size=64, processes=2) == examples
+    assert generate_dates(200, seed=1, chunk_size=64) != examples
+
+
+def test_format_datetime_matches_babel():
+    date = datetime.datetime(2020, 12, 8, 14, 5, 9)
+    for format_str in ["dd/MM/yy", "d MMMM yyyy hh:mm:ss a zzzz", "LLL''yy"]:
+        for locale in ["en_GB", "en_US"]:
+            expected = dates.format_datetime(date, format=format_str, locale=locale)
+            assert format_datetime(date, format_str, locale) == expected
+
+
+def test_batch_random():
+    rng = BatchRandom(0, block_size=16)
+    assert all(0 <= rng.randint(3, 7) < 7 for _ in range(100))
+    assert {rng.choice("ab", p=[0.0, 1.0]) for _ in range(100)} == {"b"}
+
+
+def test_python_random_state_is_restored(wiki_sentences):
+    random.seed(42)
+    expected = [random.random() for _ in range(3)]
+    random.seed(42)
+    generate_dates(200, seed=0)
+    assert [random.random() for _ in range(3)] == expected
+
+
+def test_generate_date_reuses_default_rng(wiki_sentences, monkeypatch):
+    monkeypatch.setattr(data_generation, "_default_rng", None)
+    data_generation.generate_date()
+    rng = data_generation._default_rng
+    assert isinstance(rng, BatchRandom)
+    data_generation.generate_date()
+    assert data_generation._default_rng is rng
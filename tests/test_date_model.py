@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from lazydate.models import DateModel
+
+
+def test_masked_model_bucketing_matches_full_width():
+    date_model = DateModel(mask_padding=True)
+    texts = ["8 dec 20", "the date is 12th nov 1982", "x" * 70, "y" * 250, ""]
+    inputs = date_model.input_vectorizer.transform(texts)
+    lengths = date_model.input_vectorizer.lengths(texts)
+
+    full_width = date_model._predict_fn(inputs).numpy()
+    bucketed = date_model._predict_bucketed(inputs, lengths)
+    np.testing.assert_array_equal(bucketed, full_width)
+
+
+def test_predict_proba_matches_numpy_model():
+    from lazydate.models import NumpyDateModel
+    from lazydate.models.artifact import artifact_path
+
+    date_model = DateModel(mask_padding=True, compile=False)
+    date_model.load_weights(artifact_path())
+    numpy_model = NumpyDateModel()
+    numpy_model.load_weights(artifact_path())
+
+    texts = ["8 dec 20", "the date is 12th nov 1982", "lazydate"]
+    inputs = date_model.input_vectorizer.transform(texts)
+    lengths = date_model.input_vectorizer.lengths(texts)
+    np.testing.assert_allclose(
+        date_model.predict_proba(inputs, lengths),
+        numpy_model.predict_proba(inputs, lengths),
+        atol=1e-4,
+    )
+
+
+def test_load_artifact_without_compiling():
+    from lazydate.models import NumpyDateModel
+    from lazydate.models.artifact import UNMASKED_MODEL, artifact_path
+
+    date_model = DateModel(mask_padding=True, compile=False)
+    assert date_model.model.optimizer is None
+    date_model.load_weights(artifact_path())
+    numpy_model = NumpyDateModel()
+    numpy_model.load_weights(artifact_path())
+
+    texts = ["8 dec 20", "the date is 12th nov 1982", "lazydate"]
+    assert date_model.predict_on_batch(texts) == numpy_model.predict_on_batch(texts)
+
+    with pytest.raises(ValueError, match="mask_padding"):
+        DateModel(compile=False).load_weights(artifact_path())
+    unmasked = DateModel(compile=False)
+    unmasked.load_weights(artifact_path(UNMASKED_MODEL))
+    numpy_model.load_weights(artifact_path(UNMASKED_MODEL))
+    assert unmasked.predict_on_batch(texts) == numpy_model.predict_on_batch(texts)
+
+
+def test_parse_batch_buckets_masked_artifact(tmp_path, monkeypatch):
+    from lazydate import parser
+    from lazydate.cache import LRUCache
+    from lazydate.models import NumpyDateModel, artifact
+    from lazydate.models.artifact import save_artifact
+
+    fn = str(tmp_path / "masked.npz")
+    directory = str(tmp_path / "masked")
+    DateModel(mask_padding=True, compile=False).save_numpy_weights(fn)
+    save_artifact(fn, directory)
+    monkeypatch.setattr(artifact, "artifact_path", lambda name=None: directory)
+    monkeypatch.setattr(parser, "_date_models", {})
+    monkeypatch.setattr(parser, "_vectorizers", {})
+    # Keep the untrained model's results out of the shared cache
+    monkeypatch.setattr(parser, "_cache", LRUCache(maxsize=16))
+
+    widths = []
+    encode = NumpyDateModel._encode
+
+    def spy(self, inputs, lengths):
+        widths.append(inputs.shape[1])
+        return encode(self, inputs, lengths)
+
+    monkeypatch.setattr(NumpyDateModel, "_encode", spy)
+    texts = ["8 dec 20", "12th nov 1982"]
+    parser._predict_datestrs(texts, exact=False)
+    assert widths == [len("12th nov 1982")]
+
+    date_model = parser._load_date_model()
+    inputs = date_model.input_vectorizer.transform(texts)
+    lengths = date_model.input_vectorizer.lengths(texts)
+    full_width = date_model._decode(encode(date_model, inputs, lengths))
+    np.testing.assert_allclose(
+        date_model.predict_logits(inputs, lengths), full_width, atol=1e-5
+    )
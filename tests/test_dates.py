@@ -0,0 +1,20 @@
+from datetime import datetime
+
+import numpy as np
+
+from lazydate.dates import to_datetime64, to_datetimes
+
+datestrs = ["19930822", "", "20200229", "20190229", "20201399", "19141100", "00001231"]
+expected = [datetime(1993, 8, 22), None, datetime(2020, 2, 29), None, None, None, None]
+
+
+def test_to_datetimes():
+    assert to_datetimes(datestrs) == expected
+    assert to_datetimes([]) == []
+
+
+def test_to_datetime64():
+    dates = to_datetime64(datestrs)
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert dates.tolist() == [d.date() if d else None for d in expected]
+    assert to_datetime64([]).shape == (0,)
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from lazydate.decoding import top_k_dates
+
+
+def one_hot_proba(output: str, p: float = 0.9) -> np.ndarray:
+    """(1, 8, 11) probabilities putting `p` on each character of `output`"""
+    proba = np.full((1, 8, 11), (1 - p) / 10)
+    for i, char in enumerate(output):
+        proba[0, i, 10 if char == "?" else int(char)] = p
+    return proba
+
+
+@pytest.mark.parametrize("output", ["19930822", "20200229", "????????"])
+def test_top_k_dates(output):
+    datestrs, confidences = top_k_dates(one_hot_proba(output), k=3)
+    assert datestrs[0][0] == output.replace("?", "")
+    assert confidences.shape == (1, 3)
+    assert np.all(np.diff(confidences[0]) <= 0)
+    assert confidences[0].sum() <= 1
+
+
+@pytest.mark.parametrize("output", ["20201315", "19141100", "20190229", "00001231"])
+def test_invalid_outputs_decode_to_nearest_valid_date(output):
+    datestrs, _ = top_k_dates(one_hot_proba(output), k=3)
+    for datestr in datestrs[0]:
+        datetime.strptime(datestr, "%Y%m%d")
+        assert sum(a != b for a, b in zip(datestr, output)) == 1
+
+
+def test_invalid_k():
+    with pytest.raises(ValueError):
+        top_k_dates(one_hot_proba("19930822"), k=0)
+    with pytest.raises(ValueError, match="probabilities"):
+        top_k_dates(np.full((1, 6, 11), 1 / 11))
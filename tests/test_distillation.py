@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.models import DateModel, NumpyDateModel
+from lazydate.models.artifact import (
+    UNMASKED_MODEL,
+    artifact_path,
+    read_manifest,
+    save_artifact,
+)
+from lazydate.models.config import MODEL_INPUT_NAME, MODEL_OUTPUT_NAME
+from lazydate.models.distillation import compare_models, distil
+from lazydate.models.generator import DistillationSequence
+
+TEXTS = ["8 dec 20", "the date is 12th nov 1982", "lazydate", "x" * 250, ""]
+
+
+@pytest.fixture
+def sentences(monkeypatch):
+    sentences = ["The quick brown fox jumps over the lazy dog .", "It rained ."]
+    monkeypatch.setattr(data_generation, "wiki_sentences", sentences)
+
+
+@pytest.mark.parametrize("architecture", ["cnn", "gru"])
+def test_numpy_student_matches_tensorflow(architecture, tmp_path):
+    date_model = DateModel(architecture=architecture, compile=False)
+    date_model.save_numpy_weights(str(tmp_path / "student.npz"))
+    directory = str(tmp_path / "student")
+    save_artifact(str(tmp_path / "student.npz"), directory)
+    assert read_manifest(directory)["architecture"] == architecture
+
+    inputs = date_model.input_vectorizer.transform(TEXTS)
+    lengths = date_model.input_vectorizer.lengths(TEXTS)
+    expected = date_model.predict_proba(inputs, lengths)
+    for fn in [str(tmp_path / "student.npz"), directory]:
+        numpy_model = NumpyDateModel()
+        numpy_model.load_weights(fn)
+        np.testing.assert_allclose(
+            numpy_model.predict_proba(inputs, lengths), expected, atol=1e-5
+        )
+
+    reloaded = DateModel(architecture=architecture, compile=False)
+    reloaded.load_weights(directory)
+    np.testing.assert_allclose(reloaded.predict_proba(inputs, lengths), expected)
+    with pytest.raises(ValueError, match="lstm"):
+        reloaded.load_weights(artifact_path())
+
+
+def test_students_are_unmasked():
+    with pytest.raises(ValueError, match="mask_padding"):
+        DateModel(architecture="cnn", mask_padding=True)
+    with pytest.raises(ValueError, match="architecture"):
+        DateModel(architecture="transformer")
+
+
+def test_distillation_targets():
+    teacher = NumpyDateModel()
+    teacher.load_weights(artifact_path(UNMASKED_MODEL))
+    inputs = teacher.input_vectorizer.transform(TEXTS)
+    labels = np.random.RandomState(0).randint(0, 11, (len(TEXTS), 8))
+    batch = ({MODEL_INPUT_NAME: inputs}, {MODEL_OUTPUT_NAME: labels})
+
+    sequence = DistillationSequence([batch], teacher, temperature=2.0, alpha=0.6)
+    assert len(sequence) == 1
+    x, y = sequence[0]
+    assert x[MODEL_INPUT_NAME] is inputs
+    targets = y[MODEL_OUTPUT_NAME]
+    assert targets.shape == (len(TEXTS), 8, 11)
+    np.testing.assert_allclose(targets.sum(axis=-1), 1.0, rtol=1e-5)
+    # The labels carry more than half the weight
+    np.testing.assert_array_equal(targets.argmax(axis=-1), labels)
+    assert (targets.max(axis=-1) < 1.0).all()
+
+
+def test_distil(sentences, tmp_path):
+    directory = str(tmp_path / "cnn_student")
+    history = distil(
+        "cnn",
+        directory,
+        training_examples=64,
+        validation_examples=32,
+        epochs=1,
+        seed=0,
+        filters=8,
+        hidden_dim=8,
+    )
+    assert "val_soft_sequence_accuracy" in history.history
+    assert read_manifest(directory)["config"]["dilation_rates"] == [1, 2, 4, 8]
+
+    report = compare_models(
+        [artifact_path(UNMASKED_MODEL), directory],
+        n_examples=20,
+        batch_sizes=[1, 8],
+        repeats=1,
+    )
+    teacher, student = report
+    assert teacher["agreement"] == 1.0
+    assert student["architecture"] == "cnn"
+    assert student["params"] < teacher["params"]
+    assert student["bytes"] < teacher["bytes"]
+    assert set(student["latency_us_per_string"]) == {"1", "8"}
+    assert 0.0 <= student["sequence_accuracy"] <= 1.0
+
+
+@pytest.mark.parametrize("backend", ["numpy-cnn", "numpy-gru"])
+def test_parse_with_student(backend):
+    import lazydate
+
+    lazydate.clear_cache()
+    date = lazydate.parse("the date is 12th nov 1982", exact=False, backend=backend)
+    assert (date.year, date.month, date.day) == (1982, 11, 12)
+    assert lazydate.parse_batch(["lazydate"], exact=False, backend=backend) == [None]
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import lazydate as ld
+
+document = (
+    "The committee first met on 12th nov 1982 in the old town hall. A second "
+    "session was held 03/04/1990, and the report (page 17) came out in "
+    "December 2001 after 3 delays. Renewal is due by 19 december '20. "
+) + "Nothing else happened. " * 20
+
+
+def test_extract():
+    extractions = ld.extract(document)
+    assert [(e.date, document[e.start : e.end]) for e in extractions] == [
+        (datetime(1982, 11, 12), "12th nov 1982"),
+        (datetime(1990, 4, 3), "03/04/1990"),
+        (datetime(2001, 12, 1), "December 2001"),
+        (datetime(2020, 12, 19), "19 december '20"),
+    ]
+
+
+def test_extract_misspelled_months():
+    text = "the invoice was dated 8 decembr 2020 and paid on 2 febuary 2021"
+    extractions = ld.extract(text)
+    assert [(e.date, text[e.start : e.end]) for e in extractions] == [
+        (datetime(2020, 12, 8), "8 decembr 2020"),
+        (datetime(2021, 2, 2), "2 febuary 2021"),
+    ]
+
+
+def test_extract_skips_text_without_dates():
+    before = ld.path_info()
+    assert ld.extract("Nothing else happened. " * 50) == []
+    assert ld.path_info() == before
@@ -0,0 +1,86 @@
+import pytest
+
+import lazydate as ld
+import lazydate.data_generation.data_generation as data_generation
+from lazydate import parser
+from lazydate.models.config import VOCABULARY
+from lazydate.models.gate import gate_report, may_contain_date
+from lazydate.models.vectorizer import CharVectorizer
+
+TEXTS = [
+    "20./n0vembr/2020",
+    "lazydate",
+    "",
+    "NOVEMBER 1982",
+    "the twelfth of never",
+    "x" * 250 + "1999",
+    "lazydate",
+]
+
+
+@pytest.fixture
+def spy(monkeypatch):
+    """Records the inputs the numpy model is asked to decode"""
+    date_model = parser._load_date_model("numpy")
+    seen = []
+
+    def predict_encoded(inputs, lengths):
+        seen.append(len(inputs))
+        return type(date_model).predict_encoded(date_model, inputs, lengths)
+
+    monkeypatch.setattr(date_model, "predict_encoded", predict_encoded)
+    ld.clear_cache()
+    yield seen
+    ld.set_no_date_gate(True)
+
+
+@pytest.mark.parametrize("mask_padding", [False, True])
+def test_may_contain_date(mask_padding):
+    vectorizer = CharVectorizer(VOCABULARY, mask_padding=mask_padding)
+    inputs = vectorizer.transform(TEXTS)
+    # Digits past MAX_SEQUENCE_LEN are truncated away
+    assert may_contain_date(inputs, vectorizer).tolist() == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_gated_inputs_skip_model(spy):
+    before = ld.path_info()
+    dates = ld.parse_batch(TEXTS, exact=False)
+    after = ld.path_info()
+
+    assert dates[0].year == 2020
+    assert dates[1:3] == [None, None] and dates[4:] == [None, None, None]
+    assert spy == [2]
+    assert after.gated - before.gated == 5
+    assert after.model - before.model == 2
+
+
+def test_disable_gate(spy):
+    ld.set_no_date_gate(False)
+    expected = ld.parse_batch(TEXTS, exact=False)
+    assert spy == [6]
+
+    ld.set_no_date_gate(True)
+    ld.clear_cache()
+    assert ld.parse_batch(TEXTS, exact=False) == expected
+    assert list(ld.parse_stream(TEXTS, batch_size=4, exact=False)) == expected
+    with ld.Pool(workers=2, capacity=4) as pool:
+        assert pool.parse_batch(TEXTS, exact=False) == expected
+
+
+def test_gate_report(monkeypatch):
+    sentences = ["The quick brown fox jumps over the lazy dog .", "It rained ."]
+    monkeypatch.setattr(data_generation, "wiki_sentences", sentences)
+    report = gate_report(n_examples=300, seed=0)
+    assert report["n_dates"] + report["n_no_dates"] == 300
+    assert report["false_negatives"] == 0
+    assert report["false_negative_rate"] == 0.0
+    assert report["no_date_skip_rate"] == 1.0
+    assert report["gated"] == report["n_no_dates"]
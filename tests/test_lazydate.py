@@ -1,14 +1,39 @@
-import pytest
+import subprocess
+import sys
+import threading
 from datetime import datetime
 
+import pytest
+
 import lazydate as ld
 from lazydate import __version__
+from lazydate.exact import parse_exact
 
 
 def test_version():
     assert __version__ == "0.1.0"
 
 
+def test_import_is_lazy():
+    heavy = ["tensorflow", "numpy", "babel", "nlpaug", "nltk"]
+    code = f"import sys, lazydate; print([m for m in {heavy} if m in sys.modules])"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_inference_does_not_load_training_dependencies():
+    code = (
+        "import sys, lazydate; lazydate.warmup(); "
+        "print([m for m in ['tensorflow', 'babel', 'nlpaug', 'nltk'] if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
 clean_dates = [
     ("08/12/20", datetime(2020, 12, 8)),
     ("08TH 12 2020", datetime(2020, 12, 8)),
@@ -56,3 +81,94 @@ test_dates = clean_dates + noisy_dates + surrounding_text
 @pytest.mark.parametrize("datestr, datetime", test_dates)
 def test_date_parsing(datestr, datetime):
     assert ld.parse(datestr) == datetime
+
+
+@pytest.mark.parametrize("datestr, datetime", noisy_dates + surrounding_text)
+def test_backends_agree(datestr, datetime):
+    pytest.importorskip("tensorflow")
+    ld.clear_cache()
+    numpy_date = ld.parse(datestr, backend="numpy")
+    ld.clear_cache()
+    assert ld.parse(datestr, backend="tensorflow") == numpy_date == datetime
+
+
+def test_parse_batch_with_confidence():
+    texts = ["22 aug 93", "the date is 12th nov 1982", "lazydate"]
+    results = ld.parse_batch(texts, return_confidence=True, top_k=3)
+    dates = [r.date for r in results]
+    assert dates == [datetime(1993, 8, 22), datetime(1982, 11, 12), None]
+    # Exact-format matches are certain
+    assert results[0].confidence == 1.0
+    for result in results[1:]:
+        assert len(result.candidates) == 3
+        assert result.candidates[0] == (result.date, result.confidence)
+        assert 0.5 < result.confidence <= 1.0
+
+
+def test_parse_batch_as_datetime64():
+    dates = ld.parse_batch(["22 aug 93", "lazydate"], as_datetime64=True)
+    assert dates.dtype == "datetime64[D]"
+    assert str(dates[0]) == "1993-08-22"
+    assert str(dates[1]) == "NaT"
+
+
+def test_parse_batch_uses_cache():
+    ld.clear_cache()
+    texts = ["22 aug 93", "8 dec 20", "22 aug 93"]
+    first = ld.parse_batch(texts, exact=False)
+    assert ld.cache_info().misses == 3
+    assert ld.cache_info().currsize == 2
+
+    assert ld.parse_batch(texts[::-1], exact=False) == first[::-1]
+    assert ld.cache_info().hits == 3
+    assert ld.parse("22 aug 93", exact=False) == datetime(1993, 8, 22)
+
+
+@pytest.mark.parametrize("datestr, datetime", clean_dates)
+def test_exact_parsing(datestr, datetime):
+    assert parse_exact(datestr) == datetime.strftime("%Y%m%d")
+
+
+@pytest.mark.parametrize("datestr, datetime", noisy_dates + surrounding_text + no_dates)
+def test_exact_parsing_defers_to_model(datestr, datetime):
+    assert parse_exact(datestr) is None
+
+
+def test_path_info():
+    before = ld.path_info()
+    ld.parse_batch(["22 aug 93", "20./n0vembr/2020", "12,08,1905"])
+    after = ld.path_info()
+    assert after.exact - before.exact == 2
+    assert after.model - before.model == 1
+
+
+def test_coalesced_parse_from_threads():
+    texts = [d for d, _ in noisy_dates + surrounding_text] * 8
+    expected = ld.parse_batch(texts)
+    ld.clear_cache()
+    ld.enable_coalescing(max_wait=0.01)
+    try:
+        results = [None] * len(texts)
+
+        def worker(i):
+            results[i] = ld.parse(texts[i])
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(len(texts))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        ld.disable_coalescing()
+    assert results == expected
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_parse_stream(prefetch):
+    texts = [d for d, _ in test_dates + no_dates] * 5
+    expected = ld.parse_batch(texts)
+    ld.clear_cache()
+    results = ld.parse_stream(iter(texts), batch_size=4, prefetch=prefetch)
+    assert list(results) == expected
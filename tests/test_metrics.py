@@ -0,0 +1,79 @@
+import urllib.request
+
+import pytest
+
+import lazydate
+from lazydate import parser
+from lazydate.metrics import MetricsSink, PrometheusSink, get_metrics_sink
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    # Force a model load, so its time is recorded
+    monkeypatch.setattr(parser, "_date_models", {})
+    lazydate.clear_cache()
+    sink = PrometheusSink()
+    lazydate.set_metrics_sink(sink)
+    yield sink
+    lazydate.set_metrics_sink(None)
+
+
+def _value(rendered: str, series: str) -> float:
+    for line in rendered.splitlines():
+        if line.startswith(series + " "):
+            return float(line.split()[-1])
+    raise KeyError(series)
+
+
+def test_parse_batch_metrics(sink):
+    texts = ["2020-12-08", "20./n0vembr/2020", "lazydate", "x" * 250]
+    lazydate.parse_batch(texts)
+    rendered = sink.render()
+
+    assert _value(rendered, "lazydate_inputs_total") == 4
+    assert _value(rendered, "lazydate_no_date_inputs_total") >= 1
+    assert _value(rendered, "lazydate_truncated_inputs_total") == 1
+    assert _value(rendered, "lazydate_gated_inputs_total") == 2
+    assert _value(rendered, "lazydate_batch_size_count") == 1
+    assert _value(rendered, 'lazydate_batch_size_bucket{le="4"}') == 1
+    assert _value(rendered, 'lazydate_input_length_bucket{le="+Inf"}') == 4
+    assert _value(rendered, 'lazydate_model_load_seconds_count{backend="numpy"}') == 1
+    for stage in ["exact", "vectorize", "predict", "decode", "convert"]:
+        assert _value(rendered, f'lazydate_stage_seconds_count{{stage="{stage}"}}') == 1
+
+
+def test_confidence_metrics(sink):
+    lazydate.parse_batch(["2020-12-08", "lazydate"], return_confidence=True)
+    rendered = sink.render()
+    assert _value(rendered, "lazydate_inputs_total") == 2
+    assert _value(rendered, 'lazydate_stage_seconds_count{stage="decode"}') == 1
+
+
+def test_disabled_by_default(sink):
+    lazydate.set_metrics_sink(None)
+    assert get_metrics_sink() is None
+    lazydate.parse("20./n0vembr/2020")
+    assert sink.render() == "\n"
+
+
+def test_serve(sink):
+    lazydate.parse("20./n0vembr/2020")
+    server = sink.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "# TYPE lazydate_stage_seconds histogram" in body
+    assert _value(body, "lazydate_inputs_total") == 1
+
+
+def test_sink_must_implement_interface():
+    class ObserveOnly(MetricsSink):
+        def observe(self, name, value, labels=None):
+            pass
+
+    with pytest.raises(TypeError, match="increment"):
+        ObserveOnly()
@@ -0,0 +1,45 @@
+import threading
+
+import lazydate as ld
+
+from .test_lazydate import no_dates, test_dates
+
+
+def test_pool_matches_parse_batch():
+    texts = [d for d, _ in test_dates + no_dates] * 3
+    expected = ld.parse_batch(texts)
+    ld.clear_cache()
+
+    with ld.Pool(workers=2, capacity=8) as pool:
+        assert pool.parse_batch(texts) == expected
+        assert pool.parse_batch([]) == []
+
+
+def test_pool_parent_does_not_load_model(monkeypatch):
+    from lazydate import parser
+
+    monkeypatch.setattr(parser, "_date_models", {})
+    ld.clear_cache()
+
+    with ld.Pool(workers=1, capacity=8) as pool:
+        assert pool.parse_batch(["the date is 12th nov 1982"])[0].year == 1982
+    assert parser._date_models == {}
+
+
+def test_pool_shared_between_threads():
+    texts = [d for d, _ in test_dates + no_dates]
+    expected = ld.parse_batch(texts)
+    results = {}
+
+    with ld.Pool(workers=1, capacity=4) as pool:
+
+        def worker(i):
+            ld.clear_cache()
+            results[i] = pool.parse_batch(texts)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert list(results.values()) == [expected] * 4
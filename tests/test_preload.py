@@ -0,0 +1,121 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Forks 8 workers from a fresh interpreter (the test process has TensorFlow
+# loaded) and reports each worker's growth in private memory over its first
+# batch. The parent holds the cache lock while forking, which deadlocks any
+# worker that inherits it.
+SCRIPT = """
+import json, os, sys
+import lazydate
+from lazydate import parser
+
+if sys.argv[1] == "preload":
+    lazydate.preload()
+
+TEXTS = [f"invoice {i} dated {i % 28 + 1} march {1990 + i % 30}" for i in range(64)]
+
+
+def private_kb():
+    with open("/proc/self/smaps_rollup") as f:
+        return sum(
+            int(line.split()[1])
+            for line in f
+            if line.startswith(("Private_Clean", "Private_Dirty"))
+        )
+
+
+workers = []
+with parser._cache._lock:
+    for _ in range(8):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            before = private_kb()
+            dates = lazydate.parse_batch(TEXTS, exact=False)
+            result = {"growth_kb": private_kb() - before, "dates": list(map(str, dates))}
+            os.write(write_fd, json.dumps(result).encode())
+            os._exit(0)
+        os.close(write_fd)
+        workers.append((pid, read_fd))
+
+results = []
+for pid, read_fd in workers:
+    with os.fdopen(read_fd) as f:
+        results.append(json.loads(f.read()))
+    os.waitpid(pid, 0)
+print(json.dumps(results))
+"""
+
+
+# Forks while the sink's lock is held, as when the parent's /metrics thread is
+# rendering. The child's first parse records metrics through that lock.
+SINK_SCRIPT = """
+import os
+import lazydate
+from lazydate.metrics import PrometheusSink
+
+sink = PrometheusSink()
+lazydate.set_metrics_sink(sink)
+lazydate.preload(freeze_gc=False)
+with sink._lock:
+    pid = os.fork()
+    if pid == 0:
+        lazydate.parse("20./n0vembr/2020")
+        os._exit(0 if "lazydate_inputs_total 1" in sink.render() else 1)
+_, status = os.waitpid(pid, 0)
+print(os.WEXITSTATUS(status))
+"""
+
+
+def _fork_workers(mode: str):
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT, mode],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=300,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/smaps_rollup"), reason="needs fork and Linux /proc"
+)
+def test_preloaded_workers_share_model():
+    lazy = _fork_workers("lazy")
+    preloaded = _fork_workers("preload")
+    assert len(preloaded) == 8
+    assert all(worker["dates"] == lazy[0]["dates"] for worker in lazy + preloaded)
+
+    # Lazy workers each import numpy and load the model, preloaded ones only
+    # allocate the batch
+    assert max(worker["growth_kb"] for worker in preloaded) < 8 * 1024
+    assert (
+        max(w["growth_kb"] for w in preloaded) < min(w["growth_kb"] for w in lazy) / 2
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_worker_recreates_sink_lock():
+    output = subprocess.run(
+        [sys.executable, "-c", SINK_SCRIPT],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    assert output.strip().splitlines()[-1] == "0"
+
+
+def test_preload_unknown_backend():
+    import lazydate
+
+    with pytest.raises(ValueError):
+        lazydate.preload("jax", freeze_gc=False)
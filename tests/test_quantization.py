@@ -0,0 +1,71 @@
+import threading
+
+import numpy as np
+import pytest
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.models import NumpyDateModel, TFLiteDateModel
+from lazydate.models.artifact import UNMASKED_MODEL, artifact_path
+from lazydate.models.quantization import compare_precision, save_int8_model
+
+TEXTS = ["8 dec 20", "the date is 12th nov 1982", "lazydate", "x" * 250, ""]
+
+
+@pytest.fixture(scope="module")
+def int8_fn(tmp_path_factory):
+    fn = str(tmp_path_factory.mktemp("int8") / "int8.tflite")
+    save_int8_model(fn)
+    return fn
+
+
+def test_int8_matches_float32(int8_fn):
+    float32 = NumpyDateModel()
+    float32.load_weights(artifact_path(UNMASKED_MODEL))
+    int8 = TFLiteDateModel()
+    int8.load_weights(int8_fn)
+
+    inputs = int8.input_vectorizer.transform(TEXTS)
+    lengths = int8.input_vectorizer.lengths(TEXTS)
+    proba = int8.predict_proba(inputs, lengths)
+    assert proba.shape == (len(TEXTS), 8, 11)
+    np.testing.assert_allclose(proba.sum(axis=-1), 1.0, rtol=1e-4)
+    # Every input starts from a fresh LSTM state
+    np.testing.assert_array_equal(int8.predict_proba(inputs, lengths), proba)
+    assert int8.predict_on_batch(TEXTS) == float32.predict_on_batch(TEXTS)
+    assert int8.predict_on_batch([]) == []
+
+
+def test_masked_artifact_does_not_convert(tmp_path):
+    with pytest.raises(ValueError, match="masked"):
+        save_int8_model(str(tmp_path / "int8.tflite"), artifact_path())
+
+
+def test_int8_interpreter_per_thread(int8_fn):
+    int8 = TFLiteDateModel()
+    int8.load_weights(int8_fn)
+    expected = int8.predict_on_batch(TEXTS)
+    results = []
+
+    def predict():
+        results.append(int8.predict_on_batch(TEXTS))
+
+    threads = [threading.Thread(target=predict) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [expected] * 4
+
+
+def test_compare_precision(int8_fn, monkeypatch):
+    sentences = ["The quick brown fox jumps over the lazy dog .", "It rained ."]
+    monkeypatch.setattr(data_generation, "wiki_sentences", sentences)
+    report = compare_precision(
+        int8_fn=int8_fn, n_examples=20, batch_sizes=[1, 8], repeats=1
+    )
+    assert report["int8"]["bytes"] < report["float32"]["bytes"]
+    assert set(report["int8"]["latency_us_per_string"]) == {"1", "8"}
+    assert report["accuracy_delta"] == pytest.approx(
+        report["int8"]["sequence_accuracy"] - report["float32"]["sequence_accuracy"]
+    )
+    assert 0.0 <= report["agreement"] <= 1.0
@@ -0,0 +1,32 @@
+import numpy as np
+
+from lazydate.models.config import DIGITS, MAX_SEQUENCE_LEN, VOCABULARY
+from lazydate.models.vectorizer import CharVectorizer
+
+
+def test_transform_truncates_pads_and_handles_unk():
+    vectorizer = CharVectorizer(vocabulary=VOCABULARY)
+    unk = vectorizer.encoder["<unk>"]
+    arr = vectorizer.transform(["ab", "A\x00é", "1" * (MAX_SEQUENCE_LEN + 10), ""])
+
+    assert arr.shape == (4, MAX_SEQUENCE_LEN)
+    assert arr.dtype == np.int32
+    assert arr[0, :3].tolist() == [vectorizer.encoder["a"], vectorizer.encoder["b"], 0]
+    assert arr[1, :3].tolist() == [unk, unk, unk]
+    assert (arr[2] == vectorizer.encoder["1"]).all()
+    assert (arr[3] == 0).all()
+
+
+def test_transform_into_buffer():
+    vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
+    buffer = np.full((4, 8), 7, dtype=np.int32)
+    arr = vectorizer.transform(["12"], out=buffer)
+
+    assert arr.base is buffer
+    assert buffer[0].tolist() == [1, 2, 0, 0, 0, 0, 0, 0]
+
+
+def test_inverse_transform():
+    vectorizer = CharVectorizer(vocabulary=DIGITS, max_sequence_len=8)
+    arr = vectorizer.transform(["20201208", "<unk>", "19930822"])
+    assert vectorizer.inverse_transform(arr) == ["20201208", "", "19930822"]
@@ -0,0 +1,39 @@
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+import lazydate.data_generation.data_generation as data_generation
+from lazydate.data_generation import wiki
+
+TEXT = (
+    " = Café Society = \n The café opened in 1938 . It closed in 1948 .\n"
+    " Its owner , Barney Josephson , moved to Zürich . Nothing more is known ."
+)
+
+
+def test_wiki_sentences(tmp_path, monkeypatch):
+    # An untrained tokenizer, the punkt models are not needed for the offsets
+    monkeypatch.setattr(wiki, "_punkt_tokenizer", PunktSentenceTokenizer)
+    raw_path = tmp_path / "wiki.train.raw"
+    raw_path.write_text(TEXT, encoding="utf-8")
+
+    index = wiki.build_index(str(raw_path))
+    assert index.dtype == "int64"
+    sentences = wiki.WikiSentences(str(raw_path))
+    expected = PunktSentenceTokenizer().tokenize(TEXT)
+    assert len(sentences) == len(expected) > 1
+    assert [sentences[i] for i in range(len(sentences))] == expected
+
+    monkeypatch.setattr(data_generation, "WIKIDATA_LOC", str(raw_path))
+    monkeypatch.setattr(data_generation, "wiki_sentences", None)
+    assert isinstance(data_generation.load_wikidata_sentences(), wiki.WikiSentences)
+
+
+def test_wiki_sentences_crlf(tmp_path, monkeypatch):
+    monkeypatch.setattr(wiki, "_punkt_tokenizer", PunktSentenceTokenizer)
+    text = TEXT.replace("\n", "\r\n")
+    raw_path = tmp_path / "wiki.train.raw"
+    raw_path.write_bytes(text.encode("utf-8"))
+
+    wiki.build_index(str(raw_path))
+    sentences = wiki.WikiSentences(str(raw_path))
+    expected = PunktSentenceTokenizer().tokenize(text)
+    assert [sentences[i] for i in range(len(sentences))] == expected